@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Mide la memoria por nodo del AST de RegEx y de su forma de arena para
+allow-lists generadas (uniones de k palabras), y guarda los resultados en
+results/ast_memory.csv. Como los nodos se comparten, "nodes" cuenta los nodos
+distintos y "tree nodes" los del árbol sin compartir. "table bytes" es la
+parte de "ast bytes" que ocupa la tabla de nodos compartidos.
+
+Como referencia, "baseline bytes" es la memoria de la misma lista con la
+representación original del AST: nodos binarios (cada Concat y Union con dos
+hijos) con un __dict__ por instancia, sin compartir subárboles.
+
+Se ejecuta desde el directorio experiments: python3 ast_memory.py
+"""
+import csv
+import random
+import string
+import sys
+import tracemalloc
+import weakref
+from functools import reduce
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+
+from regex import Char, Concat, Union  # noqa: E402
+from regex.arena import RegExArena  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+ALTERNATIVES = [1000, 2500, 5000, 10000]
+WORD_LENGTH = 8
+
+
+class BaselineRegEx:
+    """Nodo del AST original: atributos en un __dict__ por instancia."""
+
+
+class BaselineChar(BaselineRegEx):
+    def __init__(self, char):
+        self.char = char
+
+
+class BaselineConcat(BaselineRegEx):
+    def __init__(self, exp1, exp2):
+        self.exp1 = exp1
+        self.exp2 = exp2
+
+
+class BaselineUnion(BaselineRegEx):
+    def __init__(self, exp1, exp2):
+        self.exp1 = exp1
+        self.exp2 = exp2
+
+
+def baseline_allow_list(words):
+    """Arma la unión de las palabras con nodos binarios, como el parser original."""
+    return reduce(BaselineUnion, [reduce(BaselineConcat, map(BaselineChar, word)) for word in words])
+
+
+def traced(build):
+    """Construye con build() y devuelve (resultado, bytes en total, bytes de la tabla de nodos)."""
+    tracemalloc.start()
+    result = build()
+    snapshot = tracemalloc.take_snapshot()
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    table = sum(
+        stat.size for stat in snapshot.statistics("filename")
+        if stat.traceback[0].filename == weakref.__file__
+    )
+    return result, total, table
+
+
+def allow_list(words):
+    """Arma la unión de las palabras dadas (con la forma que genera el parser)."""
+    return Union(*[Concat(*[Char(char) for char in word]) for word in words])
+
+
+def measure(alternatives):
+    random.seed(alternatives)
+    words = [
+        "".join(random.choices(string.ascii_lowercase, k=WORD_LENGTH))
+        for _ in range(alternatives)
+    ]
+
+    baseline, baseline_bytes, _ = traced(lambda: baseline_allow_list(words))
+    del baseline
+    regex, ast_bytes, table_bytes = traced(lambda: allow_list(words))
+
+    arena = RegExArena.from_regex(regex)
+    assert arena.to_regex() is regex
+
+    tree_nodes = regex.size()
+
+    return {
+        "alternatives": alternatives,
+        "tree nodes": tree_nodes,
+        "nodes": len(arena),
+        "baseline bytes": baseline_bytes,
+        "ast bytes": ast_bytes,
+        "table bytes": table_bytes,
+        "ast bytes / tree node": ast_bytes / tree_nodes,
+        "ast bytes / node": ast_bytes / len(arena),
+        "arena bytes": arena.nbytes(),
+        "arena bytes / node": arena.nbytes() / len(arena),
+    }
+
+
+if __name__ == "__main__":
+    results = [measure(alternatives) for alternatives in ALTERNATIVES]
+    with open(join(RESULTS_DIR, "ast_memory.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compara la ejecución en lote con NumPy (CompiledRegEx.match_batch) y
+match_many (en el proceso y repartida en PROCESSES procesos) contra decidir
+cada cadena por separado con el AFD, la función generada y re, sobre
+muchas cadenas cortas (nombres de usuario al azar), y guarda los resultados
+en results/batch.csv.
+
+Se ejecuta desde el directorio experiments: python3 batch.py
+"""
+import csv
+import random
+import string
+import sys
+import time
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep", "parse_regex"))
+
+from parse_regex import parse_regex  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+PATTERN = "[a-z][a-z0-9_]*"
+COUNTS = [10_000, 100_000, 1_000_000]
+PROCESSES = 4
+ALPHABET = string.ascii_lowercase + string.digits + "_-."
+
+
+def usernames(count):
+    rng = random.Random(count)
+    return ["".join(rng.choices(ALPHABET, k=rng.randint(4, 16))) for _ in range(count)]
+
+
+def elapsed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def measure(count):
+    words = usernames(count)
+    regex = parse_regex(PATTERN)
+    afd, generated, re_engine = regex.compile(), regex.compile("codegen"), regex.compile("re")
+
+    afd.match_batch(words[:1])  # importa numpy fuera de la medición
+    loop_time, expected = elapsed(lambda: [afd.match(word) for word in words])
+    codegen_time, _ = elapsed(lambda: [generated.match(word) for word in words])
+    re_time, _ = elapsed(lambda: [re_engine.match(word) for word in words])
+    batch_time, result = elapsed(lambda: afd.match_batch(words))
+    assert list(result) == expected
+    many_time, result = elapsed(lambda: list(generated.match_many(words)))
+    assert result == expected
+    processes_time, result = elapsed(lambda: list(generated.match_many(words, processes=PROCESSES)))
+    assert result == expected
+
+    return {
+        "strings": count,
+        "accepts (s)": loop_time,
+        "codegen (s)": codegen_time,
+        "re (s)": re_time,
+        "batch (s)": batch_time,
+        "batch speedup": loop_time / batch_time,
+        "match_many codegen (s)": many_time,
+        f"match_many codegen x{PROCESSES} (s)": processes_time,
+    }
+
+
+if __name__ == "__main__":
+    results = [measure(count) for count in COUNTS]
+    with open(join(RESULTS_DIR, "batch.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Mide el tiempo de AFND.determinize sobre (a|b)*a(a|b){n}, cuyo AFD tiene
+2^(n+1) estados, y guarda los resultados en results/determinize.csv.
+
+Se ejecuta desde el directorio experiments: python3 determinize.py
+"""
+import csv
+import sys
+import time
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+
+from regex import Char, Concat, Star, Union  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+SIZES = [4, 6, 8, 10, 12]
+
+
+def nth_from_last(n):
+    """Devuelve (a|b)*a(a|b){n}: la (n+1)-ésima letra desde el final es una a."""
+    a_or_b = Union(Char("a"), Char("b"))
+    return Concat(Star(a_or_b), Char("a"), *[a_or_b] * n)
+
+
+def measure(n):
+    afnd = nth_from_last(n).to_afnd()
+    start = time.perf_counter()
+    afd = afnd.determinize()
+    elapsed = time.perf_counter() - start
+    return {
+        "n": n,
+        "afnd states": len(afnd.states),
+        "afd states": len(afd.states),
+        "time": elapsed,
+        "afd states / s": len(afd.states) / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    results = [measure(n) for n in SIZES]
+    with open(join(RESULTS_DIR, "determinize.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
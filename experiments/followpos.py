@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compara la construcción directa del AFD a partir del AST (RegEx.to_afd, con
+followpos) contra to_afnd().determinize() sobre los patrones de los
+experimentos 1 y 2, y guarda tiempos y cantidad de estados en
+results/followpos.csv.
+
+Se ejecuta desde el directorio experiments: python3 followpos.py
+"""
+import csv
+import string
+import sys
+import time
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+
+from regex import Char, Concat, Star, Union  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+REPETITIONS = 5
+EXP2_SIZES = [5, 10, 15, 20, 25]
+
+
+def nested_stars(depth):
+    """Devuelve (ab)* anidado depth veces, como en el experimento 1."""
+    regex = Concat(Char("a"), Char("b"))
+    for _ in range(depth):
+        regex = Star(regex)
+    return regex
+
+
+def exp2_regex(size):
+    """Devuelve (c1* d1 | ... | ck* dk), como en el experimento 2."""
+    letters = string.ascii_letters
+    return Union(
+        *[Concat(Star(Char(letters[i])), Char(letters[size + i])) for i in range(size)]
+    )
+
+
+def best_time(build):
+    best = None
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        afd = build()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, afd
+
+
+def measure(name, regex):
+    followpos_time, followpos_afd = best_time(regex.to_afd)
+    subset_time, subset_afd = best_time(lambda: regex.to_afnd().determinize())
+    return {
+        "regex": name,
+        "followpos states": len(followpos_afd.states),
+        "subset states": len(subset_afd.states),
+        "followpos time": followpos_time,
+        "subset time": subset_time,
+    }
+
+
+if __name__ == "__main__":
+    patterns = [(f"exp1 depth {depth}", nested_stars(depth)) for depth in (1, 2, 3)]
+    patterns += [(f"exp2 size {size}", exp2_regex(size)) for size in EXP2_SIZES]
+
+    results = [measure(name, regex) for name, regex in patterns]
+    with open(join(RESULTS_DIR, "followpos.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
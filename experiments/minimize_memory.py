@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Mide tiempo y pico de memoria de AFD.minimize sobre el AFD de un literal de
+n caracteres (una cadena de estados que necesita unas n rondas de
+refinamiento para separarse), y guarda los resultados en
+results/minimize_memory.csv.
+
+Se ejecuta desde el directorio experiments: python3 minimize_memory.py
+"""
+import csv
+import sys
+import time
+import tracemalloc
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+
+from regex import Char, Concat  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+LENGTHS = [10, 25, 50, 100, 200, 400]
+
+
+def measure(length):
+    afd = Concat(*[Char("ab"[i % 2]) for i in range(length)]).to_afd()
+    states = afd.size()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    afd.minimize()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "length": length,
+        "afd states": states,
+        "min afd states": afd.size(),
+        "time": elapsed,
+        "peak bytes": peak,
+    }
+
+
+if __name__ == "__main__":
+    results = [measure(length) for length in LENGTHS]
+    with open(join(RESULTS_DIR, "minimize_memory.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
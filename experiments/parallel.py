@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compara leer una única cadena muy larga de forma serial (AFD.accepts) contra
+leerla por tramos en paralelo componiendo funciones de estados
+(AFD.accepts_parallel, con PROCESSES procesos), y contra calcular esas mismas
+funciones en un solo proceso (el costo de la especulación sin paralelismo),
+para cadenas de largo creciente. Guarda los tiempos y el punto de cruce (el
+menor largo en que el paralelo le gana al serial, si lo hay) en
+results/parallel.csv.
+
+Se ejecuta desde el directorio experiments: python3 parallel.py
+"""
+import csv
+import os
+import random
+import sys
+import time
+from os.path import dirname, join
+
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep"))
+sys.path.insert(0, join(dirname(__file__), "..", "tlengrep", "parse_regex"))
+
+from parse_regex import parse_regex  # noqa: E402
+
+RESULTS_DIR = join(dirname(__file__), "results")
+PROCESSES = 4
+LENGTHS = [10_000, 100_000, 1_000_000, 10_000_000]
+PATTERNS = {
+    # Una línea de log: converge enseguida a un único estado.
+    "log": ("[a-z0-9 =:]*", "abcdefghijklmnopqrstuvwxyz0123456789 =:"),
+    # El cuarto caracter desde el final es una a: 16 estados.
+    "suffix": ("(a|b)*a(a|b)(a|b)(a|b)", "ab"),
+}
+
+
+def elapsed(run):
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def sequential_mappings(afd, word, chunks):
+    """Compone las funciones de estados de los tramos, calculadas en este proceso."""
+    size = -(-len(word) // chunks)
+    state = afd.initial_state
+    for start in range(0, len(word), size):
+        states = [afd.initial_state] if start == 0 else None
+        state = afd.state_mapping(word[start:start + size], states)[state]
+        if state is None:
+            return False
+    return state in afd.final_states
+
+
+def measure(name, pattern, alphabet, length):
+    afd = parse_regex(pattern).compile().afd
+    rng = random.Random(length)
+    word = "".join(rng.choices(alphabet, k=length))
+    serial_time, expected = elapsed(lambda: afd.accepts(word))
+    sequential_time, result = elapsed(lambda: sequential_mappings(afd, word, PROCESSES))
+    assert result == expected
+    parallel_time, result = elapsed(lambda: afd.accepts_parallel(word, PROCESSES))
+    assert result == expected
+    return {
+        "pattern": name,
+        "states": afd.size(),
+        "length": length,
+        "cpus": os.cpu_count(),
+        "serial (s)": serial_time,
+        "mappings in one process (s)": sequential_time,
+        f"parallel x{PROCESSES} (s)": parallel_time,
+    }
+
+
+if __name__ == "__main__":
+    results = []
+    for name, (pattern, alphabet) in PATTERNS.items():
+        rows = [measure(name, pattern, alphabet, length) for length in LENGTHS]
+        crossover = next(
+            (row["length"] for row in rows if row[f"parallel x{PROCESSES} (s)"] < row["serial (s)"]), "none"
+        )
+        for row in rows:
+            row["crossover"] = crossover
+        results.extend(rows)
+    with open(join(RESULTS_DIR, "parallel.csv"), "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=results[0].keys())
+        writer.writeheader()
+        writer.writerows(results)
+    for row in results:
+        print(row)
@@ -1,3 +1,5 @@
 from automata.af import AF
 from automata.afd import AFD
 from automata.afnd import AFND
+from automata.errors import StateLimitExceeded
+from automata.matcher import AFDMatcher, AFNDMatcher, Matcher
@@ -6,6 +6,11 @@ from typing import Hashable, List, Dict
 __all__ = ["AF"]
 
 
+def _label(state: Hashable) -> str:
+    """Nombre con el que se muestra un estado: los numerados se ven como q0, q1, ..."""
+    return f"q{state}" if isinstance(state, int) else str(state)
+
+
 class AF(ABC):
     """Clase abstracta que representa un autómata finito."""
 
@@ -20,6 +25,11 @@ class AF(ABC):
         """Devuelve la cantidad de estados del autómata."""
         return len(self.states)
 
+    @abstractmethod
+    def transitions_count(self) -> int:
+        """Devuelve la cantidad de transiciones del autómata."""
+        pass
+
     def add_state(self, state: Hashable, final: bool = False):
         """
         Agrega un estado al autómata.
@@ -81,46 +91,27 @@ class AF(ABC):
 
         return self
 
-    def normalize_states(self, prefix: str = "q"):
+    def normalize_states(self):
         """
-        Normaliza los nombres de los estados según la convención q0, q1, q2, ...
-        por defecto, se puede pasar un parametro adicional para manejar el prefijo.
+        Renumera los estados como 0, 1, 2, ... (el inicial es el 0) en una
+        sola pasada: arma el mapa de nombres viejos a nuevos y reconstruye los
+        estados, los finales y las transiciones. Al mostrar el autómata los
+        estados se ven como q0, q1, q2, ...
 
         Modifica el autómata (no crea una copia) y devuelve el autómata modificado.
         """
         new_names = {}
         if self.initial_state is not None:
-            new_names[self.initial_state] = f"{prefix}{0}"
-        for i, state in enumerate(self.states - {self.initial_state}):
-            if state not in new_names:
-                new_names[state] = f"{prefix}{i + 1}"
-
-        # Ordenamos los estados para hacer el renombre sin pisar ninguno
-        ordered_new_names = []
-        while len(new_names) > 0:
-            for old_name, new_name in new_names.items():
-                if old_name == new_name or new_name not in new_names.keys():
-                    ordered_new_names.append([old_name, new_name, False])
-                    del new_names[old_name]
-                    break
-            else:
-                # Detectamos un loop entre las operaciones de renombre
-                # Hay que usar un nombre temporal
-                old_name, new_name = next(iter(new_names.items()))
-                ordered_new_names.append([old_name, new_name, True])
-                del new_names[old_name]
-
-        # Realizamos el renombre
-        for old_name, new_name, use_temp in ordered_new_names:
-            if use_temp:
-                while new_name in self.states:
-                    new_name = f"temp:{new_name}"
-            self._rename_state(old_name, new_name)
-
-        # Eliminamos los nombres temporales
+            new_names[self.initial_state] = 0
         for state in self.states:
-            if state.startswith("temp:"):
-                self._rename_state(state, state.split(":")[-1])
+            if state not in new_names:
+                new_names[state] = len(new_names)
+
+        self.states = set(new_names.values())
+        if self.initial_state is not None:
+            self.initial_state = 0
+        self.final_states = {new_names[state] for state in self.final_states}
+        self._renumber_transitions(new_names)
 
         return self
 
@@ -131,7 +122,7 @@ class AF(ABC):
         table = []
         for state in self.transitions:
             row = [
-                f"{state}{'*' if state in self.final_states else ('^' if state == self.initial_state else '')}"
+                f"{_label(state)}{'*' if state in self.final_states else ('^' if state == self.initial_state else '')}"
             ]
             row.extend(self._transitions_to_str(state).values())
             table.append(row)
@@ -139,25 +130,13 @@ class AF(ABC):
 
     def __str__(self):
         """Imprime el autómata."""
-        return f"{self.__class__.__name__}<{self.states}, {self.alphabet}, δ, {self.initial_state}, {self.final_states}>"
-
-    def _rename_state(self, old_name: Hashable, new_name: Hashable):
-        """Renombra un estado del autómata."""
-        if old_name != new_name:
-            self.states.remove(old_name)
-            self.states.add(new_name)
-            if old_name == self.initial_state:
-                self.initial_state = new_name
-            if old_name in self.final_states:
-                self.final_states.remove(old_name)
-                self.final_states.add(new_name)
-            self._rename_state_in_transitions(old_name, new_name)
-
-        return self
+        states = "{" + ", ".join(map(_label, self.states)) + "}"
+        final_states = "{" + ", ".join(map(_label, self.final_states)) + "}"
+        return f"{self.__class__.__name__}<{states}, {self.alphabet}, δ, {_label(self.initial_state)}, {final_states}>"
 
     @abstractmethod
-    def _rename_state_in_transitions(self, old_name: Hashable, new_name: Hashable):
-        """Renombra un estado dentro de las transiciones del autómata."""
+    def _renumber_transitions(self, new_names: Dict[Hashable, int]):
+        """Reemplaza las transiciones por las mismas con los estados renombrados."""
         pass
 
     @abstractmethod
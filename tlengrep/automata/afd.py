@@ -1,12 +1,35 @@
-from typing import Hashable, List, Dict
-from automata.af import AF
+import os
+from collections import deque
+from hashlib import sha256
+from multiprocessing import Pool
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+from automata.af import AF, _label
 
 __all__ = ["AFD"]
 
+# AFD de cada proceso trabajador (ver AFD.accepts_parallel).
+_worker_afd = None
+
+
+def _init_worker(afd):
+    """(Interno) Guarda el AFD en el proceso trabajador, para no enviarlo con cada tramo."""
+    global _worker_afd
+    _worker_afd = afd
+
+
+def _chunk_mapping(task):
+    """(Interno) Calcula en el proceso trabajador la función de estados de un tramo."""
+    word, states = task
+    return _worker_afd.state_mapping(word, states)
+
 
 class AFD(AF):
     """Autómata finito determinístico."""
 
+    def transitions_count(self) -> int:
+        """Devuelve la cantidad de transiciones del autómata."""
+        return sum(len(transitions) for transitions in self.transitions.values())
+
     def add_transition(self, state1: Hashable, state2: Hashable, char: str):
         """Agrega una transición al autómata."""
         if state1 not in self.states:
@@ -19,46 +42,42 @@ class AFD(AF):
         return self
 
     def minimize(self):
-        """Minimiza el autómata."""
-        classes = {
-            state: {'=eq': 'F' if state in self.final_states else 'N'}
-            for state in self.states
-        }
-        q_of_classes = 0
+        """
+        Minimiza el autómata refinando la partición en clases de equivalencia
+        (algoritmo de Moore). Cada clase es un número, y en cada ronda los
+        estados se reagrupan por la tupla de su clase y las clases a las que
+        van con cada símbolo, hasta que la cantidad de clases no cambia.
+        """
+        alphabet = sorted(self.alphabet)
+        classes = {state: int(state in self.final_states) for state in self.states}
+        q_of_classes = len(set(classes.values()))
         while True:
-            prior_q_of_classes = q_of_classes
-            rows = {}
-            # Agrego las clases de equivalencia de cada estado
-            for state in self.states:
-                transitions = sorted(self._transitions_to_str(state).items())
-                rows[state] = classes[state]['=eq']
-                for char, to_state in transitions:
-                    rows[state] += classes[to_state]['=eq']
-                    classes[state][char] = classes[to_state]['=eq']
+            signatures = {}
+            new_classes = {}
+            for state, transitions in self.transitions.items():
+                signature = (classes[state], *(classes[transitions[char]] for char in alphabet))
+                new_classes[state] = signatures.setdefault(signature, len(signatures))
+            classes = new_classes
             # Verifico si dejé de agregar clases de equivalencia
-            q_of_classes = len({v['=eq'] for _, v in classes.items()})
-            if prior_q_of_classes == q_of_classes:
+            if len(signatures) == q_of_classes:
                 break
-            # Actualizo las nuevas clases de equivalencia
-            for state in self.states:
-                classes[state]['=eq'] = rows[state]
+            q_of_classes = len(signatures)
 
         final_states = self.final_states
         initial_state = self.initial_state
+        transitions = self.transitions
         self._reset_transitions()
 
-        new_states = set()
         # Agrego los estados y transiciones del nuevo autómata en base a las clases de equivalencia
-        for state, v in classes.items():
-            if v['=eq'] not in new_states:
-                self.add_state(v['=eq'], state in final_states)
-                new_states.add(v['=eq'])
-            if state == initial_state:
-                self.mark_initial_state(v['=eq'])
-        # Agrego las transiciones del nuevo autómata en base a las clases de equivalencia
-        for v in classes.values():
-            for char in self.alphabet:
-                self.add_transition(v['=eq'], v[char], char)
+        representatives = {}
+        for state, eq in classes.items():
+            if eq not in representatives:
+                representatives[eq] = state
+                self.add_state(eq, state in final_states)
+        self.mark_initial_state(classes[initial_state])
+        for eq, state in representatives.items():
+            for char in alphabet:
+                self.add_transition(eq, classes[transitions[state][char]], char)
         return self.normalize_states()
 
     def minimize_hopcroft(self):
@@ -115,6 +134,405 @@ class AFD(AF):
 
         return result
 
+    def canonical(self) -> "AFD":
+        """
+        Devuelve una copia del autómata con los estados alcanzables numerados
+        en el orden en que los recorre un BFS desde el inicial, siguiendo el
+        alfabeto ordenado. Dos AFD mínimos que reconocen el mismo lenguaje
+        tienen la misma forma canónica.
+        """
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para canonizar al automata."
+            )
+
+        alphabet = sorted(self.alphabet)
+        names = {self.initial_state: 0}
+        order = deque([self.initial_state])
+        result = AFD().add_state(0, final=self.initial_state in self.final_states)
+        result.mark_initial_state(0)
+        result.alphabet = set(self.alphabet)
+        while order:
+            state = order.popleft()
+            for char in alphabet:
+                if char not in self.transitions[state]:
+                    continue
+                next_state = self.transitions[state][char]
+                if next_state not in names:
+                    names[next_state] = len(names)
+                    result.add_state(names[next_state], final=next_state in self.final_states)
+                    order.append(next_state)
+                result.add_transition(names[state], names[next_state], char)
+
+        return result
+
+    def fingerprint(self) -> str:
+        """
+        Devuelve un hash (SHA-256, estable entre ejecuciones) de la forma
+        canónica del autómata. Aplicado a AFD mínimos, dos expresiones
+        equivalentes tienen la misma huella.
+        """
+        canonical = self.canonical()
+        alphabet = sorted(canonical.alphabet)
+        rows = [repr(alphabet)]
+        for state in range(canonical.size()):
+            transitions = canonical.transitions[state]
+            targets = [transitions.get(char, -1) for char in alphabet]
+            rows.append(f"{int(state in canonical.final_states)}:{targets}")
+        return sha256("\n".join(rows).encode()).hexdigest()
+
+    def equivalent(self, other: "AFD") -> bool:
+        """
+        Determina si ambos autómatas reconocen el mismo lenguaje con el
+        algoritmo de Hopcroft y Karp: une con union-find los pares de estados
+        que deben ser equivalentes, empezando por los iniciales, y falla si
+        alguno junta un estado final con uno que no lo es. Una transición que
+        falta va al estado trampa (None).
+        """
+        alphabet = self.alphabet | other.alphabet
+        parent = {}
+
+        def find(state):
+            root = state
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while state != root:
+                parent[state], state = root, parent[state]
+            return root
+
+        def step(side, state, char):
+            automaton = self if side == 0 else other
+            if state is None:
+                return (side, None)
+            return (side, automaton.transitions[state].get(char))
+
+        def final(pair):
+            side, state = pair
+            automaton = self if side == 0 else other
+            return state is not None and state in automaton.final_states
+
+        initial1, initial2 = (0, self.initial_state), (1, other.initial_state)
+        parent[initial1] = initial2
+        pending = [(initial1, initial2)]
+        while pending:
+            pair1, pair2 = pending.pop()
+            if final(pair1) != final(pair2):
+                return False
+            for char in alphabet:
+                next1 = step(*pair1, char)
+                next2 = step(*pair2, char)
+                root1, root2 = find(next1), find(next2)
+                if root1 != root2:
+                    parent[root1] = root2
+                    pending.append((next1, next2))
+
+        return True
+
+    def intersection(self, other: "AFD") -> "AFD":
+        """Devuelve un AFD que reconoce las cadenas que aceptan ambos autómatas."""
+        return self._product(other, lambda final1, final2: final1 and final2)
+
+    def difference(self, other: "AFD") -> "AFD":
+        """Devuelve un AFD que reconoce las cadenas que acepta self pero no other."""
+        return self._product(other, lambda final1, final2: final1 and not final2)
+
+    def complement(self, alphabet: Optional[Iterable[str]] = None) -> "AFD":
+        """
+        Devuelve un AFD que reconoce las cadenas sobre el alfabeto del
+        autómata (más los símbolos de alphabet, si se da) que este no acepta.
+        Las transiciones que faltan se completan con un estado trampa, que
+        pasa a ser final.
+        """
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para complementar al automata."
+            )
+
+        alphabet = sorted(self.alphabet.union(alphabet or ()))
+        names = {self.initial_state: 0}
+        for state in self.states:
+            names.setdefault(state, len(names))
+        dead = len(names)
+
+        result = AFD()
+        for state, name in names.items():
+            result.add_state(name, final=state not in self.final_states)
+        result.mark_initial_state(0)
+        for state, name in names.items():
+            for char in alphabet:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    if dead not in result.states:
+                        result.add_state(dead, final=True)
+                    result.add_transition(name, dead, char)
+                else:
+                    result.add_transition(name, names[next_state], char)
+        if dead in result.states:
+            for char in alphabet:
+                result.add_transition(dead, dead, char)
+
+        return result
+
+    def _product(self, other: "AFD", accept: Callable[[bool, bool], bool]) -> "AFD":
+        """
+        Construcción por producto: los estados son los pares de estados de
+        ambos autómatas alcanzables desde el par inicial, y un par es final si
+        accept(final en self, final en other). El AFD resultante es completo
+        sobre la unión de los alfabetos; None representa el estado trampa de
+        un autómata sin transición para el símbolo, y los pares desde los que
+        ya no se puede aceptar se juntan en un único estado trampa.
+        """
+        if self.initial_state is None or other.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial en ambos automatas para combinarlos."
+            )
+
+        # Desde un par con un componente trampa solo importa si se puede
+        # aceptar con ese componente no final.
+        dead_self = not accept(False, True) and not accept(False, False)
+        dead_other = not accept(True, False) and not accept(False, False)
+
+        def final(pair):
+            return accept(pair[0] in self.final_states, pair[1] in other.final_states)
+
+        alphabet = sorted(self.alphabet | other.alphabet)
+        initial = (self.initial_state, other.initial_state)
+        result = AFD().add_state(0, final=final(initial)).mark_initial_state(0)
+        names = {initial: 0}
+        pending = [initial]
+        while pending:
+            pair = pending.pop()
+            state1, state2 = pair
+            for char in alphabet:
+                next1 = None if state1 is None else self.transitions[state1].get(char)
+                next2 = None if state2 is None else other.transitions[state2].get(char)
+                if (next1 is None and dead_self) or (next2 is None and dead_other):
+                    next1 = next2 = None
+                target = (next1, next2)
+                if target not in names:
+                    names[target] = len(names)
+                    result.add_state(names[target], final=final(target))
+                    pending.append(target)
+                result.add_transition(names[pair], names[target], char)
+
+        return result
+
+    def _dead_states(self) -> set:
+        """(Interno) Estados trampa: no finales y cuyas transiciones vuelven a sí mismos."""
+        return {
+            state
+            for state in self.states
+            if state not in self.final_states
+            and all(next_state == state for next_state in self.transitions.get(state, {}).values())
+        }
+
+    def to_python(self, name: str = "accepts") -> str:
+        """
+        Genera el código fuente de una función de Python name(word) que
+        decide si el autómata acepta la cadena, con las transiciones escritas
+        en el código en lugar de buscarlas en diccionarios: cada estado es un
+        bloque de ifs sobre el caracter, y el bloque del estado actual se
+        elige con una búsqueda binaria sobre su número. Los estados trampa
+        (no finales y sin salida) y las transiciones que faltan terminan
+        rechazando la cadena.
+        """
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para generar el código del automata."
+            )
+
+        dead = self._dead_states()
+        # Solo los estados vivos tienen código; a los trampa nunca se llega.
+        numbers = {self.initial_state: 0}
+        for state in self.states - dead:
+            numbers.setdefault(state, len(numbers))
+        finals = sorted(numbers[state] for state in self.final_states)
+        by_number = sorted(numbers, key=numbers.get)
+
+        def state_code(state, indent):
+            targets = {}
+            for char in sorted(self.transitions[state]):
+                next_state = self.transitions[state][char]
+                if next_state not in dead:
+                    targets.setdefault(next_state, []).append(char)
+            lines = []
+            keyword = "if"
+            for next_state, chars in targets.items():
+                condition = f"char == {chars[0]!r}" if len(chars) == 1 else f"char in {set(chars)!r}"
+                action = "continue" if next_state == state else f"state = {numbers[next_state]}"
+                lines.append(f"{indent}{keyword} {condition}:")
+                lines.append(f"{indent}    {action}")
+                keyword = "elif"
+            if lines:
+                lines.append(f"{indent}else:")
+                lines.append(f"{indent}    return False")
+            else:
+                lines.append(f"{indent}return False")
+            return lines
+
+        def dispatch(first, last, indent):
+            if first == last:
+                return state_code(by_number[first], indent)
+            middle = (first + last + 1) // 2
+            return [
+                f"{indent}if state < {middle}:",
+                *dispatch(first, middle - 1, indent + "    "),
+                f"{indent}else:",
+                *dispatch(middle, last, indent + "    "),
+            ]
+
+        lines = [f"def {name}(word):"]
+        if self.initial_state in dead:
+            lines.append("    return False")
+            return "\n".join(lines) + "\n"
+        lines.append("    state = 0")
+        lines.append("    for char in word:")
+        lines.extend(dispatch(0, len(by_number) - 1, "        "))
+        lines.append(f"    return state in {set(finals)!r}" if finals else "    return False")
+        return "\n".join(lines) + "\n"
+
+    def compile_python(self, name: str = "accepts") -> Callable[[str], bool]:
+        """Compila el código de to_python y devuelve la función generada."""
+        namespace = {}
+        exec(compile(self.to_python(name), f"<{self.__class__.__name__} {name}>", "exec"), namespace)
+        return namespace[name]
+
+    def accepts_batch(self, words: Sequence[str]):
+        """
+        Determina qué cadenas de words acepta el automata, avanzando todas a
+        la vez con NumPy: las cadenas se concatenan en un arreglo de símbolos
+        (con el desplazamiento de cada una), las transiciones se guardan en
+        una tabla plana de enteros y en cada paso se avanza una columna (el i-ésimo
+        caracter de cada cadena) con indexado vectorizado, solo para las
+        cadenas que todavía tienen caracteres. Devuelve un arreglo de bool.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("accepts_batch requiere numpy (pip install numpy).") from e
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para ejecutar al automata."
+            )
+
+        # Los estados y símbolos se numeran; el último estado es una trampa
+        # para las transiciones que faltan y el último símbolo representa a
+        # los caracteres que no están en el alfabeto.
+        alphabet = sorted(self.alphabet)
+        symbols = {char: i for i, char in enumerate(alphabet)}
+        numbers = {self.initial_state: 0}
+        for state in self.states:
+            numbers.setdefault(state, len(numbers))
+        dead = len(numbers)
+        table = np.full((dead + 1, len(alphabet) + 1), dead, dtype=np.int32)
+        for state, transitions in self.transitions.items():
+            for char, next_state in transitions.items():
+                table[numbers[state], symbols[char]] = numbers[next_state]
+        finals = np.zeros(dead + 1, dtype=bool)
+        finals[[numbers[state] for state in self.final_states]] = True
+
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        offsets = np.zeros(len(words), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        # surrogatepass: un surrogate suelto se codifica como su propio código,
+        # que (como en accepts) no está en el alfabeto.
+        code_points = np.frombuffer("".join(words).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+        # Tabla de código de caracter a símbolo; los caracteres por encima
+        # del mayor del alfabeto caen en la última posición (desconocido).
+        top = max(map(ord, alphabet), default=-1) + 1
+        lookup = np.full(top + 1, len(alphabet), dtype=np.int64)
+        lookup[[ord(char) for char in alphabet]] = np.arange(len(alphabet))
+        codes = lookup[np.minimum(code_points, top)]
+
+        # Ordenando por largo decreciente, las cadenas que siguen activas en
+        # cada columna son un prefijo del orden; active[i] es cuántas tienen
+        # más de i caracteres. Los estados se guardan ya multiplicados por el
+        # ancho de la tabla, así cada paso es una suma y un indexado plano.
+        order = np.argsort(-lengths, kind="stable")
+        positions = offsets[order]
+        active = np.cumsum(np.bincount(lengths, minlength=1)[::-1])[::-1][1:]
+        width = len(alphabet) + 1
+        flat = (table.astype(np.int64) * width).ravel()
+        states = np.zeros(len(words), dtype=np.int64)
+        for count in active.tolist():
+            current = states[:count]
+            current += codes[positions[:count]]
+            current[:] = flat[current]
+            positions[:count] += 1
+
+        accepted = np.empty(len(words), dtype=bool)
+        accepted[order] = finals[states // width]
+        return accepted
+
+    def state_mapping(self, word: str, states: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, Optional[Hashable]]:
+        """
+        Devuelve la función que lleva cada estado de states (por defecto,
+        todos) al estado en que termina el automata al leer word desde él, o
+        a None si falta alguna transición en el camino. Los recorridos se
+        hacen juntos y se unen cuando llegan al mismo estado: en cada paso se
+        avanza una vez por estado distinto, y en cuanto queda uno solo se
+        sigue como en accepts.
+        """
+        starts = list(self.states if states is None else states)
+        groups = {state: [state] for state in starts}
+        transitions = self.transitions
+        for position, char in enumerate(word):
+            if len(groups) <= 1:
+                break
+            following = {}
+            for state, group in groups.items():
+                next_state = transitions[state].get(char)
+                if next_state is None:
+                    continue
+                if next_state in following:
+                    following[next_state].extend(group)
+                else:
+                    following[next_state] = group
+            groups = following
+        else:
+            position = len(word)
+
+        mapping = dict.fromkeys(starts)
+        for state, group in groups.items():
+            for char in word[position:]:
+                state = transitions[state].get(char)
+                if state is None:
+                    break
+            for start in group:
+                mapping[start] = state
+        return mapping
+
+    def accepts_parallel(self, word: str, processes: Optional[int] = None, chunks: Optional[int] = None) -> bool:
+        """
+        Determina si una cadena es aceptada repartiendo su lectura entre
+        processes procesos (por defecto, uno por CPU): la cadena se parte en
+        chunks tramos (por defecto, uno por proceso), para cada tramo se
+        calcula en paralelo su función de estados (ver state_mapping; el
+        primero solo desde el estado inicial, el resto desde todos) y se
+        componen de izquierda a derecha. Conviene solo para cadenas muy
+        largas: cada tramo cuesta más que leerlo desde un único estado, y
+        levantar los procesos tiene un costo fijo.
+        """
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para ejecutar al automata."
+            )
+        if not word:
+            return self.initial_state in self.final_states
+        processes = processes or os.cpu_count() or 1
+        size = -(-len(word) // (chunks or processes))
+        tasks = [(word[start:start + size], None) for start in range(0, len(word), size)]
+        tasks[0] = (tasks[0][0], [self.initial_state])
+        with Pool(processes, _init_worker, (self,)) as pool:
+            mappings = pool.map(_chunk_mapping, tasks, chunksize=1)
+
+        state = self.initial_state
+        for mapping in mappings:
+            state = mapping[state]
+            if state is None:
+                return False
+        return state in self.final_states
+
     def accepts(self, word: str) -> bool:
         """Determina si una cadena es aceptada por el automata. (En tiempo lineal, duuuh.)"""
         current_state = self.initial_state
@@ -129,16 +547,14 @@ class AFD(AF):
 
         return False
 
-    def _rename_state_in_transitions(self, old_name: Hashable, new_name: Hashable):
-        """Renombra un estado dentro de las transiciones del autómata."""
-        self.transitions[new_name] = self.transitions[old_name]
-        del self.transitions[old_name]
-        for state in self.transitions:
-            for char in self.transitions[state]:
-                if self.transitions[state][char] == old_name:
-                    self.transitions[state][char] = new_name
-
-        return self
+    def _renumber_transitions(self, new_names: Dict[Hashable, int]):
+        """Reemplaza las transiciones por las mismas con los estados renombrados."""
+        self.transitions = {
+            new_names[state]: {
+                char: new_names[next_state] for char, next_state in transitions.items()
+            }
+            for state, transitions in self.transitions.items()
+        }
 
     def _get_extended_alphabet(self) -> List[str]:
         """Obtiene el alfabeto extendido del autómata (incluyendo símbolos especiales)."""
@@ -149,7 +565,7 @@ class AFD(AF):
         transitions = {}
         for char in self._get_extended_alphabet():
             if char in self.transitions[state]:
-                transitions[char] = self.transitions[state][char]
+                transitions[char] = _label(self.transitions[state][char])
             else:
                 transitions[char] = "-"
         return transitions
@@ -1,9 +1,9 @@
 from enum import Enum
-from typing import FrozenSet, Hashable, Union, List, Dict, Set
-from collections import deque
+from typing import FrozenSet, Hashable, Union, List, Dict, Optional, Set
 
-from automata.af import AF
+from automata.af import AF, _label
 from automata.afd import AFD
+from automata.errors import StateLimitExceeded
 
 
 __all__ = ["AFND"]
@@ -13,9 +13,89 @@ class SpecialSymbol(Enum):
     Lambda = "λ"
 
 
+def _bits(mask: int):
+    """Genera los índices de los bits prendidos de la máscara."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class _SparseSet:
+    """
+    (Interno) Conjunto de números en [0, capacity) con pertenencia, inserción
+    y vaciado en O(1): dense guarda los elementos en orden de inserción y
+    sparse la posición de cada uno en dense (válida solo si lo confirma).
+    """
+
+    __slots__ = ("dense", "sparse", "size")
+
+    def __init__(self, capacity: int):
+        self.dense = [0] * capacity
+        self.sparse = [0] * capacity
+        self.size = 0
+
+    def add(self, i: int) -> bool:
+        """Agrega i al conjunto e indica si no estaba."""
+        position = self.sparse[i]
+        if position < self.size and self.dense[position] == i:
+            return False
+        self.sparse[i] = self.size
+        self.dense[self.size] = i
+        self.size += 1
+        return True
+
+    def clear(self):
+        self.size = 0
+
+    def __contains__(self, i: int) -> bool:
+        position = self.sparse[i]
+        return position < self.size and self.dense[position] == i
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.dense[: self.size])
+
+
+def _add_closure(states: _SparseSet, i: int, lambdas: List[List[int]]):
+    """Agrega el estado i y los que alcanza por transiciones lambda."""
+    if not states.add(i):
+        return
+    pending = [i]
+    while pending:
+        for j in lambdas[pending.pop()]:
+            if states.add(j):
+                pending.append(j)
+
+
 class AFND(AF):
     """Autómata finito no determinístico (con transiciones lambda)."""
 
+    def __init__(self):
+        super().__init__()
+        # Tablas que se calculan a demanda (ver _closure_table y
+        # _simulation_table) y se descartan cuando el autómata cambia.
+        self._closures = None
+        self._simulation = None
+
+    def add_state(self, state: Hashable, final: bool = False):
+        self._drop_tables()
+        return super().add_state(state, final)
+
+    def add_prefix(self, prefix: str):
+        self._drop_tables()
+        return super().add_prefix(prefix)
+
+    def transitions_count(self) -> int:
+        """Devuelve la cantidad de transiciones del autómata (incluyendo las lambda)."""
+        return sum(
+            len(next_states)
+            for transitions in self.transitions.values()
+            for next_states in transitions.values()
+        )
+
     def add_transition(
         self, state1: Hashable, state2: Hashable, char: Union[str, SpecialSymbol]
     ):
@@ -27,85 +107,207 @@ class AFND(AF):
         if char not in self.transitions[state1]:
             self.transitions[state1][char] = set()
         self.transitions[state1][char].add(state2)
+        self._drop_tables()
         if char is not SpecialSymbol.Lambda:
             self.alphabet.add(char)
 
         return self
 
-    def determinize(self) -> AFD:
-        """Determiniza el autómata."""
-        if not self.initial_state:
+    def accepts(self, word: str) -> bool:
+        """
+        Determina si una cadena es aceptada, simulando el AFND sin
+        determinizarlo: se mantiene el conjunto de estados actuales y se
+        avanza con cada caracter, agregando las clausuras lambda a medida que
+        se alcanzan los estados. Usa memoria proporcional a la cantidad de
+        estados y tiempo O(len(word) * estados).
+        """
+        if self.initial_state is None:
             raise ValueError(
-                f"Se requiere un estado inicial para determinizar al automata."
+                f"Se requiere un estado inicial para simular al automata."
             )
 
-        # States of the new automata, they are sets of states of the current one
-        new_initial = frozenset(self._l_closure(set([self.initial_state])))
-        new_states = set([new_initial])
-        unvisited = set([new_initial])
-        transitions = []
-
-        while unvisited:
-            t = unvisited.pop()
-
-            for a in self.alphabet:
-                u = self._move(t, a)
-
-                if not u in new_states:
-                    new_states.add(frozenset(u))
-                    unvisited.add(frozenset(u))
-
-                transitions.append((t, a, u))
-
-        final_states = set()
-
-        for new_s in new_states:
-            for s in new_s:
-                if s in self.final_states:
-                    final_states.add(new_s)
-                    break
-
-        nonfinal_states = new_states - final_states
-
-        afd = AFD()
-
-        for s in nonfinal_states:
-            afd.add_state(s)
-        for s in final_states:
-            afd.add_state(s, final=True)
-
-        afd.mark_initial_state(new_initial)
+        index, order, lambdas, moves = self._simulation_table()
+        current = _SparseSet(len(lambdas))
+        following = _SparseSet(len(lambdas))
+        _add_closure(current, index[self.initial_state], lambdas)
+        for char in word:
+            following.clear()
+            for i in current:
+                for j in moves[i].get(char, ()):
+                    _add_closure(following, j, lambdas)
+            current, following = following, current
+            if not current:
+                return False
+
+        final_states = self.final_states
+        return any(order[i] in final_states for i in current)
+
+    def _simulation_table(self):
+        """
+        Devuelve (index, order, lambdas, moves) con los estados numerados: el
+        número de cada estado, los estados en orden, y las transiciones lambda
+        y las de cada símbolo como listas de números. Solo depende de los
+        estados y las transiciones: el estado inicial y los finales se leen
+        del autómata en cada uso, ya que pueden cambiar sin pasar por
+        add_state o add_transition.
+        """
+        if self._simulation is not None:
+            return self._simulation
+
+        index, order, _ = self._closure_table()
+        lambdas = []
+        moves = []
+        for state in order:
+            lambdas.append([])
+            moves.append({})
+            for char, next_states in self.transitions[state].items():
+                targets = [index[next_state] for next_state in next_states]
+                if char is SpecialSymbol.Lambda:
+                    lambdas[-1] = targets
+                else:
+                    moves[-1][char] = targets
+
+        self._simulation = (index, order, lambdas, moves)
+        return self._simulation
+
+    def _drop_tables(self):
+        """Descarta las tablas calculadas a partir de los estados y transiciones."""
+        self._closures = None
+        self._simulation = None
+
+    def determinize(self, max_states: Optional[int] = None) -> AFD:
+        """
+        Determiniza el autómata con la construcción de subconjuntos. Los
+        estados se numeran y cada subconjunto se representa como una máscara
+        de bits; de cada subconjunto solo se exploran los símbolos para los que
+        alguno de sus estados tiene transiciones, y el resto va al estado
+        trampa (el subconjunto vacío), así el AFD resultante es completo.
 
-        for org, letter, dest in transitions:
-            afd.add_transition(org, dest, letter)
+        Si se da max_states y el AFD lo supera, lanza StateLimitExceeded.
+        """
+        if self.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para determinizar al automata."
+            )
 
-        afd.normalize_states()
+        index, _, closures = self._closure_table()
+        moves = [{} for _ in index]
+        for state, i in index.items():
+            for char, next_states in self.transitions[state].items():
+                if char is not SpecialSymbol.Lambda:
+                    mask = 0
+                    for next_state in next_states:
+                        mask |= closures[index[next_state]]
+                    moves[i][char] = mask
+        finals = 0
+        for state in self.final_states:
+            finals |= 1 << index[state]
+
+        alphabet = sorted(self.alphabet)
+        initial = closures[index[self.initial_state]]
+        afd = AFD().add_state(0, final=bool(initial & finals))
+        afd.mark_initial_state(0)
+        names = {initial: 0}
+        pending = [initial]
+        while pending:
+            subset = pending.pop()
+            targets = {}
+            for i in _bits(subset):
+                for char, mask in moves[i].items():
+                    targets[char] = targets.get(char, 0) | mask
+            for char in alphabet:
+                # Las máscaras de moves ya incluyen la clausura lambda.
+                target = targets.get(char, 0)
+                if target not in names:
+                    if max_states is not None and len(names) >= max_states:
+                        raise StateLimitExceeded(
+                            f"El AFD supera los {max_states} estados."
+                        )
+                    names[target] = len(names)
+                    afd.add_state(names[target], final=bool(target & finals))
+                    pending.append(target)
+                afd.add_transition(names[subset], names[target], char)
 
         return afd
 
-    def _move(self, states: FrozenSet[Hashable], letter: str):
-        res = set()
-        for s in states:
-            if letter in self.transitions[s]:
-                res = res.union(self.transitions[s][letter])
-
-        return self._l_closure(res)
-
     def _l_closure(self, states: Set[Hashable]) -> Set[Hashable]:
-        """Calcula la clausura lambda de un estado con BFS. (Se podria recursivamente con PD?)"""
-        visited = set(states)
-        q = deque(states)
-
-        while q:
-            s = q.popleft()
-
-            if SpecialSymbol.Lambda in self.transitions[s]:
-                for l_neighbour in self.transitions[s][SpecialSymbol.Lambda]:
-                    if not l_neighbour in visited:
-                        q.append(l_neighbour)
-                        visited.add(l_neighbour)
-
-        return visited
+        """Calcula la clausura lambda de un conjunto de estados."""
+        index, order, closures = self._closure_table()
+        mask = 0
+        for state in states:
+            mask |= closures[index[state]]
+        return {order[i] for i in _bits(mask)}
+
+    def _closure_table(self):
+        """
+        Devuelve (index, order, closures): el número de cada estado, los
+        estados en ese orden y la clausura lambda de cada uno como máscara de
+        bits. Se calcula una sola vez con el algoritmo de Tarjan, que condensa
+        los ciclos de transiciones lambda y entrega cada componente después de
+        todas las que alcanza, y se recalcula si el autómata cambia.
+        """
+        if self._closures is not None:
+            return self._closures
+
+        order = list(self.states)
+        index = {state: i for i, state in enumerate(order)}
+        successors = [
+            [index[s] for s in self.transitions[state].get(SpecialSymbol.Lambda, ())]
+            for state in order
+        ]
+
+        closures = [0] * len(order)
+        number = [-1] * len(order)
+        low = [0] * len(order)
+        on_stack = [False] * len(order)
+        stack = []
+        counter = 0
+        for root in range(len(order)):
+            if number[root] != -1:
+                continue
+            number[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter(successors[root]))]
+            while work:
+                v, pending = work[-1]
+                for w in pending:
+                    if number[w] == -1:
+                        number[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, iter(successors[w])))
+                        break
+                    if on_stack[w]:
+                        low[v] = min(low[v], number[w])
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        low[u] = min(low[u], low[v])
+                    if low[v] != number[v]:
+                        continue
+                    # v es la raíz de una componente: las componentes que
+                    # alcanza ya tienen su clausura calculada.
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    closure = 0
+                    for w in component:
+                        closure |= 1 << w
+                        for x in successors[w]:
+                            closure |= closures[x]
+                    for w in component:
+                        closures[w] = closure
+
+        self._closures = (index, order, closures)
+        return self._closures
 
     def concat(self, other):
         """Dado otro AFND, devuelve un automata que reconoce el lenguaje
@@ -159,7 +361,14 @@ class AFND(AF):
         clausura de Kleene al lenguaje reconocido por self."""
         self.positive_closure()
 
-        self.final_states.add(self.initial_state)
+        # El inicial puede tener transiciones entrantes, así que no alcanza con
+        # marcarlo como final: agregamos un nuevo estado inicial que acepta λ.
+        new_initial = f"{self.initial_state}*"
+        while new_initial in self.states:
+            new_initial = f"{new_initial}*"
+        self.add_state(new_initial, final=True)
+        self.add_transition(new_initial, self.initial_state, SpecialSymbol.Lambda)
+        self.mark_initial_state(new_initial)
 
         return self
 
@@ -177,17 +386,16 @@ class AFND(AF):
 
         return result
 
-    def _rename_state_in_transitions(self, old_name: Hashable, new_name: Hashable):
-        """Renombra un estado dentro de las transiciones del autómata."""
-        self.transitions[new_name] = self.transitions[old_name]
-        del self.transitions[old_name]
-        for state in self.transitions:
-            for char in self.transitions[state]:
-                if old_name in self.transitions[state][char]:
-                    self.transitions[state][char].remove(old_name)
-                    self.transitions[state][char].add(new_name)
-
-        return self
+    def _renumber_transitions(self, new_names: Dict[Hashable, int]):
+        """Reemplaza las transiciones por las mismas con los estados renombrados."""
+        self._drop_tables()
+        self.transitions = {
+            new_names[state]: {
+                char: {new_names[next_state] for next_state in next_states}
+                for char, next_states in transitions.items()
+            }
+            for state, transitions in self.transitions.items()
+        }
 
     def _get_extended_alphabet(self) -> List[str]:
         """Obtiene el alfabeto extendido del autómata (incluyendo símbolos especiales)."""
@@ -198,7 +406,7 @@ class AFND(AF):
         transitions = {}
         for char in self._get_extended_alphabet():
             if char in self.transitions[state]:
-                transitions[char] = ",".join(self.transitions[state][char])
+                transitions[char] = ",".join(map(_label, self.transitions[state][char]))
             else:
                 transitions[char] = "-"
         return transitions
@@ -0,0 +1,5 @@
+__all__ = ["StateLimitExceeded"]
+
+
+class StateLimitExceeded(Exception):
+    pass
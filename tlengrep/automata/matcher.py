@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+
+from automata.afd import AFD
+from automata.afnd import AFND, _SparseSet, _add_closure
+
+__all__ = ["Matcher", "AFDMatcher", "AFNDMatcher"]
+
+
+class Matcher(ABC):
+    """
+    Reconocimiento incremental: guarda el estado del autómata entre llamadas,
+    así una cadena puede procesarse de a pedazos (feed) sin armarla entera, y
+    finish indica si lo leído hasta ahora es aceptado. Copiar un matcher
+    (copy) permite retomar desde un mismo punto varias veces.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def feed(self, chunk: str) -> bool:
+        """Avanza con los caracteres de chunk e indica si todavía puede aceptar."""
+        pass
+
+    @abstractmethod
+    def finish(self) -> bool:
+        """Indica si lo leído desde el último reset es aceptado (no reinicia el matcher)."""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Vuelve al estado inicial, como si no se hubiera leído nada."""
+        pass
+
+    @abstractmethod
+    def copy(self) -> "Matcher":
+        """Devuelve un matcher independiente en el mismo estado."""
+        pass
+
+    def __copy__(self):
+        return self.copy()
+
+
+class AFDMatcher(Matcher):
+    """
+    Matcher sobre un AFD: el estado es el estado actual, o None si se llegó a
+    un estado trampa (no final y sin salida) o faltaba la transición; desde
+    ahí ya no se avanza.
+    """
+
+    __slots__ = ("transitions", "initial_state", "final_states", "state")
+
+    def __init__(self, afd: AFD):
+        if afd.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para ejecutar al automata."
+            )
+        dead = afd._dead_states()
+        self.transitions = {
+            state: {
+                char: next_state
+                for char, next_state in afd.transitions.get(state, {}).items()
+                if next_state not in dead
+            }
+            for state in afd.states
+        }
+        self.initial_state = None if afd.initial_state in dead else afd.initial_state
+        self.final_states = afd.final_states
+        self.state = self.initial_state
+
+    def feed(self, chunk: str) -> bool:
+        state = self.state
+        if state is None:
+            return False
+        transitions = self.transitions
+        for char in chunk:
+            state = transitions[state].get(char)
+            if state is None:
+                break
+        self.state = state
+        return state is not None
+
+    def finish(self) -> bool:
+        return self.state in self.final_states
+
+    def reset(self):
+        self.state = self.initial_state
+
+    def copy(self) -> "AFDMatcher":
+        matcher = object.__new__(AFDMatcher)
+        matcher.transitions = self.transitions
+        matcher.initial_state = self.initial_state
+        matcher.final_states = self.final_states
+        matcher.state = self.state
+        return matcher
+
+
+class AFNDMatcher(Matcher):
+    """
+    Matcher sobre un AFND, con la misma simulación que AFND.accepts: el
+    estado es el conjunto de estados actuales, ya cerrado por lambda.
+    """
+
+    __slots__ = ("initial", "lambdas", "moves", "finals", "current", "following")
+
+    def __init__(self, afnd: AFND):
+        if afnd.initial_state is None:
+            raise ValueError(
+                f"Se requiere un estado inicial para simular al automata."
+            )
+        index, order, self.lambdas, self.moves = afnd._simulation_table()
+        self.initial = index[afnd.initial_state]
+        self.finals = [state in afnd.final_states for state in order]
+        self.current = _SparseSet(len(self.lambdas))
+        self.following = _SparseSet(len(self.lambdas))
+        _add_closure(self.current, self.initial, self.lambdas)
+
+    def feed(self, chunk: str) -> bool:
+        current, following = self.current, self.following
+        lambdas, moves = self.lambdas, self.moves
+        for char in chunk:
+            if not current:
+                break
+            following.clear()
+            for i in current:
+                for j in moves[i].get(char, ()):
+                    _add_closure(following, j, lambdas)
+            current, following = following, current
+        self.current, self.following = current, following
+        return bool(current)
+
+    def finish(self) -> bool:
+        finals = self.finals
+        return any(finals[i] for i in self.current)
+
+    def reset(self):
+        self.current.clear()
+        _add_closure(self.current, self.initial, self.lambdas)
+
+    def copy(self) -> "AFNDMatcher":
+        matcher = object.__new__(AFNDMatcher)
+        matcher.initial, matcher.lambdas, matcher.moves, matcher.finals = (
+            self.initial, self.lambdas, self.moves, self.finals
+        )
+        matcher.current = _SparseSet(len(self.lambdas))
+        matcher.following = _SparseSet(len(self.lambdas))
+        for i in self.current:
+            matcher.current.add(i)
+        return matcher
@@ -0,0 +1,190 @@
+"""
+Benchmarks de las etapas de compilación y matching: parseo, to_afnd,
+determinize, to_afd, minimize, minimize_hopcroft, codegen (generar y
+compilar el código del AFD mínimo), accepts (AFD mínimo), generated (la
+función generada), re (el patrón traducido, con re.fullmatch), simulate
+(AFND) y naive (naive_match, sin autómatas), medidas por separado sobre las
+expresiones de tests/regexes y las familias de los experimentos 1 a 3.
+
+El experimento 3 estudia naive_match con estrellas anidadas a distintas
+profundidades, sobre cadenas más cortas que las del experimento 1; naive no
+se mide en el experimento 1, cuyas cadenas son demasiado largas para él.
+
+Cada medición es el mínimo de varias repeticiones, en milisegundos, como en
+tp1_experiments.ipynb. Se ejecuta desde el directorio tlengrep con
+python3 -m benchmarks (ver __main__.py).
+"""
+import csv
+import glob
+import importlib
+import random
+import re
+import string
+import time
+from os.path import basename, dirname, join
+
+from parse_regex import parse_regex
+
+__all__ = ["SUITES", "cases", "run", "write_csv", "read_csv", "compare"]
+
+RESULTS_DIR = join(dirname(__file__), "..", "..", "experiments", "results")
+FIELDS = ["benchmark", "regex", "stage", "instance size", "time (ms)"]
+
+SUITES = ["corpus", "exp1", "exp2", "exp3"]
+TOTAL_INSTANCES = 10
+SIZE_STEP = 100
+EXP2_SIZES = [5, 10, 15, 20, 25]
+EXP3_DEPTHS = [2, 4, 5]
+EXP3_SIZE_STEP = 10
+# Suites en las que se mide naive_match.
+NAIVE_SUITES = ["corpus", "exp2", "exp3"]
+
+
+def _exp2_pattern(size):
+    """(c1*d1|...|ck*dk), como en el experimento 2."""
+    letters = string.ascii_letters
+    return "|".join(f"{letters[i]}*{letters[size + i]}" for i in range(size))
+
+
+def _exp2_instances(size):
+    """Cadenas que recorren las clausuras y terminan con el último dk."""
+    letters = string.ascii_letters
+    alphabet = list(letters[: 2 * size - 1])
+    rng = random.Random(size)
+    return [
+        "".join(rng.choices(alphabet, k=i * SIZE_STEP)) + letters[2 * size - 1]
+        for i in range(1, TOTAL_INSTANCES + 1)
+    ]
+
+
+def cases(suites=SUITES):
+    """
+    Devuelve los casos de las suites dadas como tuplas (benchmark, nombre,
+    patrón, regex, instancias). El patrón es None si la expresión no viene de
+    un texto (no se mide su parseo); las instancias de corpus son todas las
+    cadenas de tests/strings, que se miden juntas.
+    """
+    result = []
+    if "corpus" in suites:
+        tests_dir = join(dirname(__file__), "..", "tests")
+        strings = []
+        for filename in sorted(glob.glob(join(tests_dir, "strings", "*.txt"))):
+            with open(filename) as f:
+                strings.extend(f.read().splitlines())
+        for filename in sorted(glob.glob(join(tests_dir, "regexes", "*.py"))):
+            module = importlib.import_module(f"tests.regexes.{basename(filename)[:-3]}")
+            result.append(("corpus", basename(filename)[:-3], None, module.__regex__, [strings]))
+    ab_instances = ["ab" * (i * SIZE_STEP) for i in range(1, TOTAL_INSTANCES + 1)]
+    if "exp1" in suites:
+        for pattern in ["(ab)*", "(((ab)*)*)*"]:
+            result.append(("exp1", pattern, pattern, parse_regex(pattern), ab_instances))
+    if "exp2" in suites:
+        for size in EXP2_SIZES:
+            pattern = _exp2_pattern(size)
+            result.append(("exp2", f"exp2_re_{size}", pattern, parse_regex(pattern), _exp2_instances(size)))
+    if "exp3" in suites:
+        short_instances = ["ab" * (i * EXP3_SIZE_STEP) for i in range(1, TOTAL_INSTANCES + 1)]
+        for depth in EXP3_DEPTHS:
+            pattern = "(" * depth + "ab" + ")*" * depth
+            result.append(("exp3", pattern, pattern, parse_regex(pattern), short_instances))
+    return result
+
+
+def _best_time(run, prepare=lambda: None, repeat=5):
+    """Mínimo en milisegundos de run(prepare()), sin contar prepare."""
+    best = None
+    for _ in range(repeat):
+        value = prepare()
+        start = time.perf_counter()
+        run(value)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def run(suites=SUITES, repeat=5, progress=None):
+    """
+    Mide cada etapa para cada caso de las suites dadas y devuelve las filas
+    (diccionarios con las columnas de FIELDS). progress, si se da, se llama
+    con cada fila a medida que se mide.
+    """
+    rows = []
+
+    def add(benchmark, name, stage, size, elapsed):
+        row = {"benchmark": benchmark, "regex": name, "stage": stage,
+               "instance size": size, "time (ms)": elapsed}
+        rows.append(row)
+        if progress is not None:
+            progress(row)
+
+    for benchmark, name, pattern, regex, instances in cases(suites):
+        if pattern is not None:
+            add(benchmark, name, "parse", "",
+                _best_time(lambda _: parse_regex(pattern, cache=False), repeat=repeat))
+        add(benchmark, name, "to_afnd", "", _best_time(lambda _: regex.to_afnd(), repeat=repeat))
+        add(benchmark, name, "determinize", "",
+            _best_time(lambda afnd: afnd.determinize(), regex.to_afnd, repeat))
+        add(benchmark, name, "to_afd", "", _best_time(lambda _: regex.to_afd(), repeat=repeat))
+        determinized = lambda: regex.to_afnd().determinize()
+        add(benchmark, name, "minimize", "",
+            _best_time(lambda afd: afd.minimize(), determinized, repeat))
+        add(benchmark, name, "minimize_hopcroft", "",
+            _best_time(lambda afd: afd.minimize_hopcroft(), determinized, repeat))
+
+        afd = regex.to_afnd().determinize().minimize_hopcroft()
+        add(benchmark, name, "codegen", "", _best_time(lambda _: afd.compile_python(), repeat=repeat))
+        generated = afd.compile_python()
+        afnd = regex.to_afnd()
+        fullmatch = re.compile(regex.to_re_pattern()).fullmatch
+        for instance in instances:
+            words = instance if isinstance(instance, list) else [instance]
+            size = sum(len(word) for word in words)
+            add(benchmark, name, "accepts", size,
+                _best_time(lambda _: [afd.accepts(word) for word in words], repeat=repeat))
+            add(benchmark, name, "generated", size,
+                _best_time(lambda _: [generated(word) for word in words], repeat=repeat))
+            add(benchmark, name, "re", size,
+                _best_time(lambda _: [fullmatch(word) for word in words], repeat=repeat))
+            add(benchmark, name, "simulate", size,
+                _best_time(lambda _: [afnd.accepts(word) for word in words], repeat=repeat))
+            if benchmark in NAIVE_SUITES:
+                add(benchmark, name, "naive", size,
+                    _best_time(lambda _: [regex.naive_match(word) for word in words], repeat=repeat))
+
+    return rows
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _key(row):
+    return (row["benchmark"], row["regex"], row["stage"], str(row["instance size"]))
+
+
+def compare(rows, baseline, threshold=1.5, min_time=1.0):
+    """
+    Compara las filas medidas contra las de una línea de base y devuelve las
+    regresiones: tuplas (fila, tiempo base, razón) de las mediciones que
+    tardan más de threshold veces lo que tardaban. Se ignoran las que tardan
+    menos de min_time milisegundos, donde domina el ruido.
+    """
+    baseline_times = {_key(row): float(row["time (ms)"]) for row in baseline}
+    regressions = []
+    for row in rows:
+        base = baseline_times.get(_key(row))
+        elapsed = float(row["time (ms)"])
+        if base is None or elapsed < min_time:
+            continue
+        ratio = elapsed / base if base > 0 else float("inf")
+        if ratio > threshold:
+            regressions.append((row, base, ratio))
+    return regressions
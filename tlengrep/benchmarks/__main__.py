@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import optparse
+import sys
+from os.path import join
+
+from benchmarks import RESULTS_DIR, SUITES, compare, read_csv, run, write_csv
+
+usage = "%prog [options]"
+
+opt_parser = optparse.OptionParser(usage=usage, prog="python3 -m benchmarks")
+opt_parser.add_option("-s", "--suite", dest="suites", action="append", choices=SUITES,
+                      help=f"suite to run: {', '.join(SUITES)} (can be repeated, default: all)")
+opt_parser.add_option("-r", "--repeat", dest="repeat", type="int", default=5,
+                      help="repetitions per measurement, the minimum is kept (default: %default)")
+opt_parser.add_option("-o", "--output", dest="output", default=join(RESULTS_DIR, "benchmarks.csv"),
+                      help="CSV file to write the results to (default: %default)")
+opt_parser.add_option("-b", "--baseline", dest="baseline",
+                      help="CSV file with previous results to compare against")
+opt_parser.add_option("-t", "--threshold", dest="threshold", type="float", default=1.5,
+                      help="report a regression when a measurement is this many times slower "
+                           "than the baseline (default: %default)")
+opt_parser.add_option("-m", "--min-time", dest="min_time", type="float", default=1.0,
+                      help="ignore measurements faster than this many milliseconds when comparing, "
+                           "they are dominated by noise (default: %default)")
+opt_parser.add_option("-q", "--quiet", dest="quiet", action="store_true",
+                      help="do not print each measurement")
+opts, args = opt_parser.parse_args()
+
+
+def report(row):
+    size = f" [{row['instance size']}]" if row["instance size"] != "" else ""
+    print(f"{row['benchmark']:8} {row['regex'][:30]:30} {row['stage']:18}{size}: "
+          f"{row['time (ms)']:.3f} ms", file=sys.stderr)
+
+
+rows = run(opts.suites or SUITES, opts.repeat, None if opts.quiet else report)
+write_csv(rows, opts.output)
+
+if opts.baseline:
+    regressions = compare(rows, read_csv(opts.baseline), opts.threshold, opts.min_time)
+    for row, base, ratio in regressions:
+        print(f"REGRESSION {row['benchmark']} {row['regex']} {row['stage']} "
+              f"{row['instance size']}: {base:.3f} ms -> {row['time (ms)']:.3f} ms ({ratio:.2f}x)")
+    if regressions:
+        exit(1)
+    print(f"No regressions against {opts.baseline} (threshold {opts.threshold}x).")
@@ -1,14 +1,28 @@
 import sys
+from threading import Lock
 
 from regex import RegEx
+from regex.cache import LRUCache
 from .errors import SyntaxError
 from .lexer import lexer
 from .parser import parser
 
 __all__ = ["parse_regex", "SyntaxError"]
 
+# El lexer y el parser de ply tienen estado global, así que no pueden usarse
+# desde dos threads a la vez.
+_parse_lock = Lock()
 
-def parse_regex(regex_str: str) -> RegEx:
-    lexer.input(regex_str)
+# Expresiones parseadas recientemente, indexadas por el texto del patrón.
+_parse_cache = LRUCache(maxsize=128)
 
-    return parser.parse(lexer=lexer)
+
+def parse_regex(regex_str: str, cache: bool = True) -> RegEx:
+    regex = _parse_cache.get(regex_str) if cache else None
+    if regex is None:
+        with _parse_lock:
+            lexer.input(regex_str)
+            regex = parser.parse(lexer=lexer)
+        _parse_cache.put(regex_str, regex)
+
+    return regex
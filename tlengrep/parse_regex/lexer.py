@@ -4,6 +4,8 @@ from ply.lex import TOKEN
 
 
 class RegexRange:
+    __slots__ = ("min", "max")
+
     def __init__(self, min: int, max: int) -> None:
         self.min = min
         self.max = max
@@ -16,6 +18,8 @@ class RegexRange:
 
 
 class RegexClassInterval:
+    __slots__ = ("fst", "lst")
+
     def __init__(self, fst: str, lst: str) -> None:
         self.fst = fst
         self.lst = lst
@@ -31,32 +31,50 @@ def p_regex_lambda(p):
 
 def p_union(p):
     '''
-    union : concat '|' union
+    union : alternatives
     '''
-    p[0] = Union(p[1], p[3])
+    p[0] = p[1][0] if len(p[1]) == 1 else Union(*p[1])
 
 
-def p_union_concat(p):
+def p_alternatives(p):
     '''
-    union : concat
+    alternatives : alternatives '|' concat
     '''
+    # Recursión a izquierda: ply no apila una producción por alternativa y la
+    # unión queda plana, sin importar cuántas alternativas tenga.
+    p[1].append(p[3])
     p[0] = p[1]
 
 
+def p_alternatives_concat(p):
+    '''
+    alternatives : concat
+    '''
+    p[0] = [p[1]]
+
+
 def p_concat(p):
     '''
-    concat : op concat
+    concat : ops
     '''
-    p[0] = Concat(p[1], p[2])
+    p[0] = p[1][0] if len(p[1]) == 1 else Concat(*p[1])
 
 
-def p_concat_lambda(p):
+def p_ops(p):
     '''
-    concat : op
+    ops : ops op
     '''
+    p[1].append(p[2])
     p[0] = p[1]
 
 
+def p_ops_op(p):
+    '''
+    ops : op
+    '''
+    p[0] = [p[1]]
+
+
 def p_op_kleene(p):
     '''
     op : val '*'
@@ -89,13 +107,16 @@ def p_op_range(p):
     '''
     op : val RANGE
     '''
-    unions = Empty()
-    for n in range(p[2].min, p[2].max + 1):
-        concats = Lambda()
-        for _ in range(n):
-            concats = Concat(concats, p[1])
-        unions = Union(unions, concats)
-    p[0] = unions
+    repetitions = [
+        Lambda() if n == 0 else p[1] if n == 1 else Concat(*[p[1]] * n)
+        for n in range(p[2].min, p[2].max + 1)
+    ]
+    if not repetitions:
+        p[0] = Empty()
+    elif len(repetitions) == 1:
+        p[0] = repetitions[0]
+    else:
+        p[0] = Union(*repetitions)
 
 
 def p_val_set(p):
@@ -138,14 +159,17 @@ def p_val_int(p):
     '''
     val : CLS_INT
     '''
-    p[0] = Concat(Concat(Char(p[1].fst), Char('-')), Char(p[1].lst))
+    p[0] = Concat(Char(p[1].fst), Char('-'), Char(p[1].lst))
 
 
 def p_set(p):
     '''
-    set : atom set
+    set : set atom
     '''
-    p[0] = p[1].union(p[2])
+    # Recursión a izquierda, como en alternatives: se actualiza el mismo
+    # conjunto en lugar de armar uno nuevo por cada átomo.
+    p[1].update(p[2])
+    p[0] = p[1]
 
 
 def p_set_lambda(p):
@@ -1,28 +1,308 @@
-from abc import ABC, abstractmethod
-
-from automata import AFND
+import re
+import zlib
+from abc import ABCMeta, abstractmethod
+from inspect import signature
+from threading import Lock
+from typing import Optional
+from weakref import WeakValueDictionary
+
+from automata import AFD, AFND, StateLimitExceeded
+from automata.afnd import SpecialSymbol
+from regex.cache import LRUCache
+from regex.compiled import CompiledRegEx
+from regex.stats import Observer
 
 __all__ = ["RegEx", "Empty", "Lambda", "Char", "Union", "Concat", "Star", "Plus"]
 
-
-class RegEx(ABC):
-    """Clase abstracta para representar expresiones regulares."""
+# Compilaciones recientes, indexadas por la expresión regular.
+_compile_cache = LRUCache(maxsize=128)
+
+
+class _Interned(ABCMeta):
+    """
+    (Interno) Metaclase de las expresiones regulares. Guarda los nodos vivos
+    indexados por su hash estructural: como todo nodo pasa por esta tabla, dos
+    subexpresiones iguales son el mismo objeto, y alcanza con comparar los
+    hijos por identidad. Ante una colisión de hash (muy improbable) el nodo
+    nuevo simplemente no se comparte; la igualdad sigue siendo estructural.
+
+    El hash no depende de PYTHONHASHSEED, así que sirve también para ordenar
+    (ver Union._simplify_node).
+    """
+
+    _table = WeakValueDictionary()
+    _lock = Lock()
+
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        cls._kind = zlib.crc32(name.encode())
+
+    def __call__(cls, *args, **kwargs):
+        if kwargs:
+            # Los argumentos por nombre se pasan a posicionales, así la clave
+            # es la misma se construya como se construya el nodo.
+            args = signature(cls.__init__).bind(None, *args, **kwargs).args[1:]
+        key = hash((cls._kind,) + tuple(_stable_hash(arg) for arg in args))
+        with _Interned._lock:
+            node = _Interned._table.get(key)
+            if node is None or type(node) is not cls or not all(
+                arg is node_arg or (not isinstance(arg, RegEx) and _frozen(arg) == _frozen(node_arg))
+                for arg, node_arg in zip(args, node._args())
+            ):
+                node = super().__call__(*args)
+                node._hash = key
+                _Interned._table.setdefault(key, node)
+        return node
+
+
+class RegEx(metaclass=_Interned):
+    """
+    Clase abstracta para representar expresiones regulares. Las expresiones
+    son inmutables y se comparten (hash-consing): construir una expresión igual
+    a otra que ya existe devuelve la misma instancia.
+    """
+
+    # Sin __dict__ por instancia: los patrones generados tienen muchos nodos.
+    __slots__ = ("_hash", "__weakref__")
 
     @abstractmethod
+    def _args(self) -> tuple:
+        """(Interno) Argumentos con los que se construye la expresión regular."""
+        pass
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(self) is not type(other) or hash(self) != hash(other):
+            return False
+        return self._args() == other._args()
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        # Se serializa el arena (arreglos planos) y no el árbol, que pickle
+        # recorrería recursivamente; al cargarlo, los nodos vuelven a la tabla.
+        from regex.arena import RegExArena
+
+        return (_from_arena, (RegExArena.from_regex(self),))
+
+    def _children(self) -> tuple:
+        """(Interno) Subexpresiones de la expresión regular."""
+        return ()
+
+    def _fold(self, leave, shared: bool = True):
+        """
+        (Interno) Recorre la expresión en postorden, sin recursión, y devuelve
+        el valor de la raíz. leave(nodo, valores de los hijos) calcula el valor
+        de cada nodo. Si shared, las subexpresiones repetidas (que son el mismo
+        objeto) se calculan una sola vez.
+        """
+        done = {}
+        values = []
+        pending = [(self, False)]
+        while pending:
+            node, expanded = pending.pop()
+            if shared and node in done:
+                values.append(done[node])
+                continue
+            children = node._children()
+            if children and not expanded:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(children))
+                continue
+            first = len(values) - len(children)
+            value = leave(node, values[first:])
+            del values[first:]
+            if shared:
+                done[node] = value
+            values.append(value)
+
+        return values[0]
+
     def naive_match(self, word: str) -> bool:
         """
-        Indica si la expresión regular acepta la cadena dada.
-        Implementación recursiva, poco eficiente.
+        Indica si la expresión regular acepta la cadena dada, sin construir
+        ningún autómata. Programación dinámica sobre rangos de índices de la
+        cadena: para cada subexpresión se calcula, para cada i, el conjunto
+        (como máscara de bits) de los j tales que acepta word[i:j]. Sólo se
+        calculan los pares que hacen falta, y cada uno una única vez.
+        """
+        memo = {}
+        value = self._naive_match_node(word, 0)
+        if isinstance(value, int):
+            return bool(value >> len(word) & 1)
+        pending = [(self, 0, value)]
+        value = None
+        # Cada nodo compuesto es un generador que pide (hijo, k) y recibe la
+        # máscara del hijo; los pedidos se resuelven con una pila explícita.
+        while pending:
+            node, i, evaluation = pending[-1]
+            try:
+                child, k = evaluation.send(value)
+            except StopIteration as result:
+                memo[(node, i)] = value = result.value
+                pending.pop()
+                continue
+            value = memo.get((child, k))
+            if value is None:
+                value = child._naive_match_node(word, k)
+                if isinstance(value, int):
+                    memo[(child, k)] = value
+                else:
+                    pending.append((child, k, value))
+                    value = None
+
+        return bool(memo[(self, 0)] >> len(word) & 1)
+
+    @abstractmethod
+    def _naive_match_node(self, word: str, i: int):
+        """
+        (Interno) Devuelve la máscara de bits de los j tales que la expresión
+        acepta word[i:j]. Los nodos compuestos devuelven un generador que pide
+        (hijo, k) por cada máscara de un hijo que necesita y termina con la
+        máscara del nodo.
         """
         pass
 
     def match(self, word: str) -> bool:
         """Indica si la expresión regular acepta la cadena dada."""
-        return self.to_afnd().determinize().minimize_hopcroft().accepts(word)
+        return self.compile().match(word)
+
+    def compile(self, engine: str = "afd", max_states: Optional[int] = None,
+                observer: Optional[Observer] = None) -> CompiledRegEx:
+        """
+        Compila la expresión regular para el motor dado (uno de
+        regex.compiled.ENGINES): "afd" construye el AFD mínimo, "afnd" simula
+        el AFND sin determinizarlo, "codegen" genera una función de Python con
+        las transiciones del AFD mínimo y "re" traduce la expresión a un
+        patrón del módulo re (ver CompiledRegEx). Con max_states, si el AFD
+        supera esa cantidad de estados se usa el motor "afnd" (ver
+        CompiledRegEx.fallback); el motor "re" no construye autómatas y lo
+        ignora. Las compilaciones recientes se guardan en una caché, así que
+        compilar de nuevo una expresión igual no reconstruye el autómata; si
+        se da un observer (ver regex.stats), en cambio, siempre se compila
+        para poder notificarle cada etapa.
+        """
+        key = (self, engine, max_states)
+        compiled = _compile_cache.get(key) if observer is None else None
+        if compiled is None:
+            compiled = CompiledRegEx(self, engine, max_states, observer)
+            _compile_cache.put(key, compiled)
+        return compiled
+
+    def simplify(self) -> "RegEx":
+        """
+        Devuelve una expresión regular equivalente y en general más chica,
+        aplicando reglas algebraicas (absorción de ∅, identidad de λ,
+        (r*)* = r*, r|r = r, aplanado de concatenaciones y uniones, orden de
+        uniones, y unión de caracteres sueltos en una RegClass). No modifica
+        la expresión original.
+        """
+        # Cada valor es (expresión simplificada, si acepta λ): la nulabilidad
+        # se calcula en la misma pasada, sin volver a recorrer los subárboles.
+        simplified, _ = self._fold(
+            lambda node, children: (
+                node._simplify_node(children),
+                node._nullable_node([nullable for _, nullable in children]),
+            )
+        )
+        return simplified
+
+    @abstractmethod
+    def _simplify_node(self, children: list) -> "RegEx":
+        """
+        (Interno) Simplifica el nodo, dados sus hijos ya simplificados como
+        pares (expresión, si acepta λ).
+        """
+        pass
+
+    def size(self) -> int:
+        """Devuelve la cantidad de nodos de la expresión regular."""
+        return self._fold(lambda node, children: 1 + sum(children))
 
     @abstractmethod
+    def _nullable_node(self, children: list) -> bool:
+        """(Interno) Indica si el nodo acepta la cadena vacía, dado si la aceptan sus hijos."""
+        pass
+
     def to_afnd(self) -> AFND:
         """Convierte la expresión regular a un AFND."""
+        afnd = AFND()
+        # Cada aparición de una subexpresión necesita sus propios estados.
+        initial, finals = self._fold(
+            lambda node, fragments: node._to_afnd_node(afnd, fragments), shared=False
+        )
+        afnd.mark_initial_state(initial)
+        afnd.final_states = set(finals)
+
+        return afnd
+
+    @abstractmethod
+    def _to_afnd_node(self, afnd: AFND, fragments: list) -> tuple:
+        """
+        (Interno) Agrega al AFND los estados y transiciones del nodo y devuelve
+        su fragmento (estado inicial, lista de estados finales), dados los
+        fragmentos de sus hijos.
+        """
+        pass
+
+    def to_afd(self, max_states: Optional[int] = None) -> AFD:
+        """
+        Convierte la expresión regular directamente a un AFD con la
+        construcción por followpos, sin pasar por un AFND ni calcular clausuras
+        λ. Cada Char o RegClass es una posición, y cada estado del AFD es un
+        conjunto de posiciones (representado como máscara de bits).
+
+        Si se da max_states y el AFD lo supera, lanza StateLimitExceeded.
+        """
+        symbols = []
+        follow = []
+        # Cada aparición de una subexpresión tiene sus propias posiciones.
+        nullable, first, last = self._fold(
+            lambda node, children: node._positions_node(symbols, follow, children),
+            shared=False,
+        )
+        # Posición extra que marca el fin de la cadena: los estados que la
+        # contienen son finales.
+        end = 1 << len(symbols)
+        for position in _positions(last):
+            follow[position] |= end
+        alphabet = sorted(set().union(*symbols))
+
+        initial = first | end if nullable else first
+        afd = AFD().add_state(0, final=bool(initial & end)).mark_initial_state(0)
+        states = {initial: 0}
+        pending = [initial]
+        while pending:
+            state = pending.pop()
+            targets = {}
+            for position in _positions(state & ~end):
+                for char in symbols[position]:
+                    targets[char] = targets.get(char, 0) | follow[position]
+            for char in alphabet:
+                # Sin posiciones para el símbolo vamos al estado trampa (vacío).
+                target = targets.get(char, 0)
+                if target not in states:
+                    if max_states is not None and len(states) >= max_states:
+                        raise StateLimitExceeded(
+                            f"El AFD supera los {max_states} estados."
+                        )
+                    states[target] = len(states)
+                    afd.add_state(states[target], final=bool(target & end))
+                    pending.append(target)
+                afd.add_transition(states[state], states[target], char)
+
+        return afd
+
+    @abstractmethod
+    def _positions_node(self, symbols: list, follow: list, children: list) -> tuple:
+        """
+        (Interno) Devuelve (nullable, firstpos, lastpos) del nodo, dados los de
+        sus hijos. Las hojas agregan sus posiciones a symbols (los caracteres
+        de cada posición) y a follow, y los nodos compuestos completan los
+        followpos de las posiciones de sus hijos.
+        """
         pass
 
     @abstractmethod
@@ -33,182 +313,523 @@ class RegEx(ABC):
         """
         pass
 
+    def to_re_pattern(self) -> str:
+        """
+        Traduce la expresión regular a un patrón equivalente del módulo re de
+        Python, pensado para usarse con re.fullmatch. ∅ se traduce como (?!),
+        que no acepta ninguna cadena.
+        """
+        return self._fold(lambda node, children: node._re_node(children))
+
+    @abstractmethod
+    def _re_node(self, children: list) -> str:
+        """(Interno) Patrón de re del nodo, dados los de sus hijos."""
+        pass
+
+    def __str__(self):
+        return self._fold(lambda node, children: node._str_node(children))
+
+    @abstractmethod
+    def _str_node(self, children: list) -> str:
+        """(Interno) Representación del nodo, dadas las de sus hijos."""
+        pass
+
 
 class Empty(RegEx):
     """Expresión regular que denota el lenguaje vacío (∅)."""
 
-    def naive_match(self, word: str):
+    __slots__ = ()
+
+    def _args(self):
+        return ()
+
+    def _naive_match_node(self, word: str, i: int):
+        return 0
+
+    def _simplify_node(self, children: list):
+        return self
+
+    def _nullable_node(self, children: list):
         return False
 
-    def to_afnd(self) -> AFND:
-        # No es minimal pero no es necesario ya que tenemos minimize.
-        # Es el minimal que no complejiza determinize.
-        return AFND().add_state('q0').mark_initial_state('q0')
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        return (_new_state(afnd), [])
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        return (False, 0, 0)
 
     def _atomic(self):
         return True
 
-    def __str__(self):
+    def _re_node(self, children: list):
+        return "(?!)"
+
+    def _str_node(self, children: list):
         return "∅"
 
 
 class Lambda(RegEx):
     """Expresión regular que denota el lenguaje de la cadena vacía (Λ)."""
 
-    def naive_match(self, word: str):
-        return word == ""
+    __slots__ = ()
 
-    def to_afnd(self) -> AFND:
-        return AFND().add_state('q0', final=True).mark_initial_state('q0')
+    def _args(self):
+        return ()
+
+    def _naive_match_node(self, word: str, i: int):
+        return 1 << i
+
+    def _simplify_node(self, children: list):
+        return self
+
+    def _nullable_node(self, children: list):
+        return True
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        state = _new_state(afnd)
+        return (state, [state])
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        return (True, 0, 0)
 
     def _atomic(self):
         return True
 
-    def __str__(self):
+    def _re_node(self, children: list):
+        return ""
+
+    def _str_node(self, children: list):
         return "λ"
 
 
 class Char(RegEx):
     """Expresión regular que denota el lenguaje de un determinado carácter."""
 
+    __slots__ = ("char",)
+
     def __init__(self, char: str):
         assert len(char) == 1
         self.char = char
 
-    def naive_match(self, word: str):
-        return word == self.char
+    def _args(self):
+        return (self.char,)
 
-    def to_afnd(self) -> AFND:
-        return (
-            AFND()
-            .add_state('q0')
-            .mark_initial_state('q0')
-            .add_state('q1', final=True)
-            .add_transition('q0', 'q1', self.char)
-        )
+    def _naive_match_node(self, word: str, i: int):
+        return 1 << (i + 1) if i < len(word) and word[i] == self.char else 0
+
+    def _simplify_node(self, children: list):
+        return self
+
+    def _nullable_node(self, children: list):
+        return False
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        initial, final = _new_state(afnd), _new_state(afnd)
+        afnd.add_transition(initial, final, self.char)
+        return (initial, [final])
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        position = 1 << len(symbols)
+        symbols.append((self.char,))
+        follow.append(0)
+        return (False, position, position)
 
     def _atomic(self):
         return True
 
-    def __str__(self):
+    def _re_node(self, children: list):
+        return re.escape(self.char)
+
+    def _str_node(self, children: list):
         return self.char
 
 
 class Concat(RegEx):
-    """Expresión regular que denota la concatenación de dos expresiones regulares."""
-
-    def __init__(self, exp1: RegEx, exp2: RegEx):
-        self.exp1 = exp1
-        self.exp2 = exp2
-
-    def naive_match(self, word: str):
-        for i in range(len(word) + 1):
-            if self.exp1.naive_match(word[:i]) and self.exp2.naive_match(word[i:]):
-                return True
-        return False
-
-    def to_afnd(self) -> AFND:
-        return self.exp1.to_afnd().concat(self.exp2.to_afnd())
+    """Expresión regular que denota la concatenación de dos o más expresiones regulares."""
+
+    __slots__ = ("exps",)
+
+    def __init__(self, *exps: RegEx):
+        self.exps = exps
+
+    def _args(self):
+        return self.exps
+
+    def _children(self):
+        return self.exps
+
+    def _naive_match_node(self, word: str, i: int):
+        ends = 1 << i
+        for exp in self.exps:
+            next_ends = 0
+            for k in _positions(ends):
+                next_ends |= yield (exp, k)
+            ends = next_ends
+            if not ends:
+                break
+        return ends
+
+    def _simplify_node(self, children: list):
+        exps = []
+        for exp, _ in children:
+            if isinstance(exp, Empty):
+                return exp
+            if isinstance(exp, Concat):
+                exps.extend(exp.exps)
+            elif not isinstance(exp, Lambda):
+                exps.append(exp)
+        return _concat_of(exps)
+
+    def _nullable_node(self, children: list):
+        return all(children)
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        for (_, finals), (next_initial, _) in zip(fragments, fragments[1:]):
+            for final in finals:
+                afnd.add_transition(final, next_initial, SpecialSymbol.Lambda)
+        return (fragments[0][0], fragments[-1][1])
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        nullable, first, last = children[0]
+        for exp_nullable, exp_first, exp_last in children[1:]:
+            for position in _positions(last):
+                follow[position] |= exp_first
+            if nullable:
+                first |= exp_first
+            last = last | exp_last if exp_nullable else exp_last
+            nullable = nullable and exp_nullable
+        return (nullable, first, last)
 
     def _atomic(self):
         return False
 
-    def __str__(self):
-        return (
-            f"{f'({self.exp1})' if not self.exp1._atomic() else self.exp1}"
-            f"{f'({self.exp2})' if not self.exp2._atomic() else self.exp2}"
+    def _re_node(self, children: list):
+        return "".join(
+            f"(?:{pattern})" if isinstance(exp, Union) else pattern
+            for exp, pattern in zip(self.exps, children)
         )
 
+    def _str_node(self, children: list):
+        return "".join(_parenthesize(exp, string) for exp, string in zip(self.exps, children))
 
-class Union(RegEx):
-    """Expresión regular que denota la unión de dos expresiones regulares."""
-
-    def __init__(self, exp1: RegEx, exp2: RegEx):
-        self.exp1 = exp1
-        self.exp2 = exp2
-
-    def naive_match(self, word: str):
-        return self.exp1.naive_match(word) or self.exp2.naive_match(word)
 
-    def to_afnd(self) -> AFND:
-        return self.exp1.to_afnd().union(self.exp2.to_afnd())
+class Union(RegEx):
+    """Expresión regular que denota la unión de dos o más expresiones regulares."""
+
+    __slots__ = ("exps",)
+
+    def __init__(self, *exps: RegEx):
+        self.exps = exps
+
+    def _args(self):
+        return self.exps
+
+    def _children(self):
+        return self.exps
+
+    def _naive_match_node(self, word: str, i: int):
+        ends = 0
+        for exp in self.exps:
+            ends |= yield (exp, i)
+        return ends
+
+    def _simplify_node(self, children: list):
+        # Aplanamos las uniones anidadas, descartando ∅ y repetidos, y juntando
+        # los caracteres sueltos en una única clase.
+        alternatives = {}
+        chars = set()
+        # Si algún hijo distinto de λ acepta la cadena vacía. Una unión ya
+        # simplificada que contiene λ no tiene otra alternativa que la acepte.
+        nullable = False
+        for exp, exp_nullable in children:
+            if exp_nullable and not isinstance(exp, Lambda) and not (
+                isinstance(exp, Union) and Lambda() in exp.exps
+            ):
+                nullable = True
+            for alternative in exp.exps if isinstance(exp, Union) else (exp,):
+                if isinstance(alternative, Char):
+                    chars.add(alternative.char)
+                elif isinstance(alternative, RegClass):
+                    chars.update(alternative.chars)
+                elif not isinstance(alternative, Empty):
+                    alternatives[alternative] = None
+        if chars:
+            alternatives[RegClass(chars)._simplify_node([])] = None
+
+        # λ sobra si alguna otra alternativa ya acepta la cadena vacía.
+        if nullable and Lambda() in alternatives:
+            del alternatives[Lambda()]
+
+        # Orden canónico por hash estructural, que no recorre los subárboles;
+        # una colisión (muy improbable) se desempata por la representación.
+        alternatives = sorted(alternatives, key=hash)
+        if any(hash(exp) == hash(other) for exp, other in zip(alternatives, alternatives[1:])):
+            alternatives.sort(key=lambda exp: (hash(exp), str(exp)))
+        return _union_of(alternatives)
+
+    def _nullable_node(self, children: list):
+        return any(children)
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        initial = _new_state(afnd)
+        finals = []
+        for fragment_initial, fragment_finals in fragments:
+            afnd.add_transition(initial, fragment_initial, SpecialSymbol.Lambda)
+            finals.extend(fragment_finals)
+        return (initial, finals)
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        nullable, first, last = False, 0, 0
+        for exp_nullable, exp_first, exp_last in children:
+            nullable = nullable or exp_nullable
+            first |= exp_first
+            last |= exp_last
+        return (nullable, first, last)
 
     def _atomic(self):
         return False
 
-    def __str__(self):
-        return (
-            f"{f'({self.exp1})' if not self.exp1._atomic() else self.exp1}"
-            f"|{f'({self.exp2})' if not self.exp2._atomic() else self.exp2}"
-        )
+    def _re_node(self, children: list):
+        return "|".join(children)
+
+    def _str_node(self, children: list):
+        return "|".join(_parenthesize(exp, string) for exp, string in zip(self.exps, children))
 
 
 class Star(RegEx):
     """Expresión regular que denota la clausura de Kleene de otra expresión regular."""
 
+    __slots__ = ("exp",)
+
     def __init__(self, exp: RegEx):
         self.exp = exp
 
-    def naive_match(self, word: str):
-        if word == "" or self.exp.naive_match(word):
-            return True
-        for i in range(1, len(word) + 1):
-            if self.exp.naive_match(word[:i]) and self.naive_match(word[i:]):
-                return True
-        return False
+    def _args(self):
+        return (self.exp,)
 
-    def to_afnd(self) -> AFND:
-        return self.exp.to_afnd().kleene_closure()
+    def _children(self):
+        return (self.exp,)
+
+    def _naive_match_node(self, word: str, i: int):
+        return (yield from _closure(self.exp, 1 << i))
+
+    def _simplify_node(self, children: list):
+        exp, _ = children[0]
+        if isinstance(exp, Union) and Lambda() in exp.exps:
+            # (r|λ)* = r*
+            exp = _union_of([alternative for alternative in exp.exps if alternative != Lambda()])
+        if isinstance(exp, (Empty, Lambda)):
+            return Lambda()
+        if isinstance(exp, (Star, Plus)):
+            return Star(exp.exp)
+        return Star(exp)
+
+    def _nullable_node(self, children: list):
+        return True
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        # El nuevo estado inicial acepta λ; no se puede marcar como final el
+        # inicial del hijo porque puede tener transiciones entrantes.
+        fragment_initial, fragment_finals = fragments[0]
+        for final in fragment_finals:
+            afnd.add_transition(final, fragment_initial, SpecialSymbol.Lambda)
+        initial = _new_state(afnd)
+        afnd.add_transition(initial, fragment_initial, SpecialSymbol.Lambda)
+        return (initial, fragment_finals + [initial])
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        _, first, last = children[0]
+        for position in _positions(last):
+            follow[position] |= first
+        return (True, first, last)
 
     def _atomic(self):
         return False
 
-    def __str__(self):
-        return f"({self.exp})*" if not self.exp._atomic() else f"{self.exp}*"
+    def _re_node(self, children: list):
+        return f"{_re_group(self.exp, children[0])}*"
+
+    def _str_node(self, children: list):
+        return f"{_parenthesize(self.exp, children[0])}*"
 
 
 class Plus(RegEx):
     """Expresión regular que denota la clausura positiva de otra expresión regular."""
 
+    __slots__ = ("exp",)
+
     def __init__(self, exp: RegEx):
         self.exp = exp
 
-    def naive_match(self, word: str):
-        if self.exp.naive_match(word):
-            return True
-        for i in range(1, len(word) + 1):
-            if self.exp.naive_match(word[:i]) and self.naive_match(word[i:]):
-                return True
-        return False
+    def _args(self):
+        return (self.exp,)
 
-    def to_afnd(self) -> AFND:
-        return self.exp.to_afnd().positive_closure()
+    def _children(self):
+        return (self.exp,)
+
+    def _naive_match_node(self, word: str, i: int):
+        return (yield from _closure(self.exp, (yield (self.exp, i))))
+
+    def _simplify_node(self, children: list):
+        exp, nullable = children[0]
+        if isinstance(exp, (Empty, Lambda, Star, Plus)):
+            return exp
+        if nullable:
+            # Si r acepta λ, r+ = r*
+            return Star(exp)._simplify_node(children)
+        return Plus(exp)
+
+    def _nullable_node(self, children: list):
+        return children[0]
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        initial, finals = fragments[0]
+        for final in finals:
+            afnd.add_transition(final, initial, SpecialSymbol.Lambda)
+        return (initial, finals)
+
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        nullable, first, last = children[0]
+        for position in _positions(last):
+            follow[position] |= first
+        return (nullable, first, last)
 
     def _atomic(self) -> bool:
         return False
 
-    def __str__(self):
-        return f"({self.exp})+" if not self.exp._atomic() else f"{self.exp}+"
+    def _re_node(self, children: list):
+        return f"{_re_group(self.exp, children[0])}+"
+
+    def _str_node(self, children: list):
+        return f"{_parenthesize(self.exp, children[0])}+"
+
 
 class RegClass(RegEx):
     """Expresión regular que denota una clase de caracteres."""
 
+    __slots__ = ("chars",)
+
     def __init__(self, chars: set):
-        self.chars = chars
+        # Copia inmutable: el conjunto del llamador puede cambiar después, y
+        # el nodo es compartido y está indexado por su contenido.
+        self.chars = frozenset(chars)
 
-    def naive_match(self, word: str):
-        return word in self.chars
+    def _args(self):
+        return (self.chars,)
 
-    def to_afnd(self) -> AFND:
-        afnd = AFND().add_state('q0').mark_initial_state('q0').add_state('q1', final=True)
+    def _naive_match_node(self, word: str, i: int):
+        return 1 << (i + 1) if i < len(word) and word[i] in self.chars else 0
+
+    def _simplify_node(self, children: list):
+        if len(self.chars) == 0:
+            return Empty()
+        if len(self.chars) == 1:
+            return Char(next(iter(self.chars)))
+        return self
 
+    def _nullable_node(self, children: list):
+        return False
+
+    def _to_afnd_node(self, afnd: AFND, fragments: list):
+        initial, final = _new_state(afnd), _new_state(afnd)
         for char in self.chars:
-            afnd.add_transition('q0', 'q1', char)
+            afnd.add_transition(initial, final, char)
+        return (initial, [final])
 
-        return afnd
+    def _positions_node(self, symbols: list, follow: list, children: list):
+        position = 1 << len(symbols)
+        symbols.append(tuple(self.chars))
+        follow.append(0)
+        return (False, position, position)
 
     def _atomic(self):
         return True
 
-    def __str__(self):
-        return f"[{self.chars}]"
+    def _re_node(self, children: list):
+        if not self.chars:
+            return "(?!)"
+        return "[" + "".join(re.escape(char) for char in sorted(self.chars)) + "]"
+
+    def _str_node(self, children: list):
+        return f"[{set(self.chars)}]"
+
+
+def _from_arena(arena) -> RegEx:
+    """(Interno) Reconstruye una expresión serializada (ver RegEx.__reduce__)."""
+    return arena.to_regex()
+
+
+def _frozen(value):
+    """(Interno) Versión hashable de un argumento de una expresión regular."""
+    return frozenset(value) if isinstance(value, set) else value
+
+
+def _stable_hash(value) -> int:
+    """
+    (Interno) Hash de un argumento de una expresión regular que no depende de
+    PYTHONHASHSEED: los caracteres se hashean por su código.
+    """
+    if isinstance(value, RegEx):
+        return value._hash
+    if isinstance(value, str):
+        return hash(tuple(map(ord, value)))
+    if isinstance(value, (set, frozenset)):
+        return hash(frozenset(map(_stable_hash, value)))
+    return hash(value)
+
+
+def _re_group(exp: RegEx, pattern: str) -> str:
+    """(Interno) Agrupa el patrón de re de exp para aplicarle un cuantificador."""
+    return pattern if isinstance(exp, (Char, RegClass)) else f"(?:{pattern})"
+
+
+def _parenthesize(exp: RegEx, string: str) -> str:
+    """(Interno) Agrega paréntesis a la representación de exp si no es atómica."""
+    return string if exp._atomic() else f"({string})"
+
+
+def _concat_of(exps: list) -> RegEx:
+    """(Interno) Arma la concatenación de una lista de expresiones."""
+    if not exps:
+        return Lambda()
+    if len(exps) == 1:
+        return exps[0]
+    return Concat(*exps)
+
+
+def _union_of(alternatives: list) -> RegEx:
+    """(Interno) Arma la unión de una lista de expresiones."""
+    if not alternatives:
+        return Empty()
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return Union(*alternatives)
+
+
+def _new_state(afnd: AFND) -> int:
+    """(Interno) Agrega un estado nuevo al AFND y lo devuelve."""
+    state = len(afnd.states)
+    afnd.add_state(state)
+    return state
+
+
+def _positions(mask: int):
+    """(Interno) Recorre en orden las posiciones de los bits prendidos de la máscara."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _closure(exp: RegEx, ends: int):
+    """
+    (Interno) Generador que extiende la máscara de posiciones alcanzadas con
+    las que se alcanzan concatenando cadenas aceptadas por exp, pidiendo la
+    máscara de exp en cada posición nueva (ver RegEx._naive_match_node).
+    """
+    pending = list(_positions(ends))
+    while pending:
+        new_ends = (yield (exp, pending.pop())) & ~ends
+        ends |= new_ends
+        pending.extend(_positions(new_ends))
+    return ends
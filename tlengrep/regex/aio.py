@@ -0,0 +1,100 @@
+import asyncio
+import codecs
+from typing import AsyncIterable, AsyncIterator, List, Tuple, Union
+
+__all__ = ["filter_lines"]
+
+# Un pedazo de línea (sin el salto de línea) y si con él termina la línea.
+_Piece = Tuple[str, bool]
+
+
+async def filter_lines(compiled, source: Union[asyncio.StreamReader, AsyncIterable[Union[str, bytes]]],
+                       chunk_size: int = 65536, encoding: str = "utf-8",
+                       errors: str = "strict") -> AsyncIterator[str]:
+    """
+    Devuelve, a medida que se consume, las líneas de source (sin el salto de
+    línea) que acepta la expresión compilada. source puede ser un
+    asyncio.StreamReader, que se lee de a chunk_size bytes, o un iterable
+    asincrónico de líneas (str o bytes).
+
+    Las líneas se reconocen de a pedazos con el matcher de la expresión (ver
+    CompiledRegEx.matcher), en lotes de unos chunk_size caracteres: entre
+    lote y lote se cede el control al event loop, así una línea muy larga no
+    lo bloquea. Una línea deja de guardarse en cuanto el matcher indica que
+    ya no puede aceptar. Como solo se lee cuando se pide la siguiente línea,
+    un consumidor lento frena la lectura (y el StreamReader, a su vez, deja
+    de leer del transporte cuando se llena su buffer).
+    """
+    matcher = compiled.matcher() if compiled.engine != "re" else None
+    if isinstance(source, asyncio.StreamReader):
+        batches = _stream_batches(source, chunk_size, encoding, errors)
+    else:
+        batches = _line_batches(source, chunk_size, encoding, errors)
+
+    parts = []
+    alive = True
+    async for batch in batches:
+        for text, end in batch:
+            if alive:
+                parts.append(text)
+                if matcher is not None:
+                    alive = matcher.feed(text)
+            if end:
+                if alive:
+                    line = "".join(parts)
+                    if matcher.finish() if matcher is not None else compiled.match(line):
+                        yield line
+                parts = []
+                alive = True
+                if matcher is not None:
+                    matcher.reset()
+        await asyncio.sleep(0)
+
+
+async def _stream_batches(reader: asyncio.StreamReader, chunk_size: int, encoding: str,
+                          errors: str) -> AsyncIterator[List[_Piece]]:
+    """(Interno) Lee reader de a chunk_size bytes y da los pedazos de línea de cada lectura."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors)
+    open_line = False
+    while True:
+        data = await reader.read(chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            *lines, last = text.split("\n")
+            batch = [(line, True) for line in lines]
+            batch.append((last, False))
+            open_line = bool(last) or (open_line and not lines)
+            yield batch
+        if not data:
+            # La última línea puede no terminar en un salto de línea.
+            if open_line:
+                yield [("", True)]
+            return
+
+
+async def _line_batches(lines: AsyncIterable[Union[str, bytes]], chunk_size: int, encoding: str,
+                        errors: str) -> AsyncIterator[List[_Piece]]:
+    """(Interno) Agrupa las líneas en lotes de unos chunk_size caracteres, partiendo las más largas."""
+    batch = []
+    size = 0
+    async for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode(encoding, errors)
+        if line.endswith("\n"):
+            line = line[:-1]
+        start = 0
+        while len(line) - start > chunk_size:
+            batch.append((line[start:start + chunk_size], False))
+            start += chunk_size
+            yield batch
+            batch = []
+            size = 0
+        rest = line[start:]
+        batch.append((rest, True))
+        size += len(rest) + 1
+        if size >= chunk_size:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
@@ -0,0 +1,104 @@
+from array import array
+
+from regex import RegEx, Empty, Lambda, Char, RegClass, Concat, Union, Star, Plus
+
+__all__ = ["RegExArena"]
+
+# El código de cada tipo de nodo es su posición en la tupla.
+_KINDS = (Empty, Lambda, Char, RegClass, Concat, Union, Star, Plus)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+
+
+class RegExArena:
+    """
+    Representación compacta de una expresión regular. Cada nodo es un índice,
+    y su tipo, sus hijos y su contenido (el carácter de un Char o los de una
+    RegClass) se guardan en arreglos paralelos. Los hijos del nodo i son
+    children[starts[i]:starts[i + 1]]. Los subárboles repetidos se guardan una
+    sola vez, y los hijos siempre tienen índices menores que sus padres.
+    """
+
+    __slots__ = ("kinds", "starts", "children", "payloads", "root")
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.starts = array("i", [0])
+        self.children = array("i")
+        self.payloads = []
+        self.root = -1
+
+    @classmethod
+    def from_regex(cls, regex: RegEx):
+        """Construye el arena de una expresión regular."""
+        arena = cls()
+        indexes = {}
+        pending = [(regex, False)]
+        while pending:
+            node, expanded = pending.pop()
+            if node in indexes:
+                continue
+            children = node._children()
+            if not expanded:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(children))
+                continue
+            payload = next((arg for arg in node._args() if not isinstance(arg, RegEx)), None)
+            indexes[node] = arena.add(
+                _KIND_CODES[type(node)], [indexes[child] for child in children],
+                frozenset(payload) if isinstance(payload, set) else payload,
+            )
+        arena.root = indexes[regex]
+
+        return arena
+
+    def add(self, kind: int, children: list = (), payload=None) -> int:
+        """Agrega un nodo al arena y devuelve su índice."""
+        self.kinds.append(kind)
+        self.children.extend(children)
+        self.starts.append(len(self.children))
+        self.payloads.append(payload)
+        self.root = len(self.kinds) - 1
+
+        return self.root
+
+    def to_regex(self, index: int = None) -> RegEx:
+        """Reconstruye la expresión regular del nodo dado (por defecto, la raíz)."""
+        if index is None:
+            index = self.root
+        nodes = []
+        for i in range(index + 1):
+            kind = _KINDS[self.kinds[i]]
+            if kind in (Empty, Lambda):
+                nodes.append(kind())
+            elif kind is Char:
+                nodes.append(Char(self.payloads[i]))
+            elif kind is RegClass:
+                nodes.append(RegClass(set(self.payloads[i])))
+            else:
+                children = self.children[self.starts[i]:self.starts[i + 1]]
+                nodes.append(kind(*[nodes[child] for child in children]))
+
+        return nodes[index]
+
+    def naive_match(self, word: str) -> bool:
+        """Indica si la expresión regular acepta la cadena dada (ver RegEx.naive_match)."""
+        return self.to_regex().naive_match(word)
+
+    def match(self, word: str) -> bool:
+        """Indica si la expresión regular acepta la cadena dada (ver RegEx.match)."""
+        return self.to_regex().match(word)
+
+    def nbytes(self) -> int:
+        """Devuelve la memoria (aproximada, en bytes) que ocupan los arreglos del arena."""
+        return (
+            self.kinds.itemsize * len(self.kinds)
+            + self.starts.itemsize * len(self.starts)
+            + self.children.itemsize * len(self.children)
+            + 8 * len(self.payloads)
+        )
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __str__(self):
+        return str(self.to_regex())
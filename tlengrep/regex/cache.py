@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Any
+
+__all__ = ["LRUCache"]
+
+
+class LRUCache:
+    """
+    Caché acotada que descarta la entrada usada hace más tiempo cuando se
+    llena. Es segura para usar desde varios threads.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Devuelve el valor asociado a la clave, o default si no está."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        """Asocia el valor a la clave, descartando la entrada más vieja si hace falta."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return self
+
+    def clear(self):
+        """Vacía la caché."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+        return self
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,238 @@
+import re
+from collections import deque
+from itertools import compress, islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from automata import AFDMatcher, AFNDMatcher, Matcher, StateLimitExceeded
+from regex.aio import filter_lines
+from regex.cache import LRUCache
+from regex.stats import Observer, automaton_details
+
+__all__ = ["CompiledRegEx"]
+
+ENGINES = ("afd", "afnd", "codegen", "re")
+
+# AFD mínimos canónicos recientes, indexados por su huella: las expresiones
+# equivalentes comparten el mismo autómata.
+_afd_cache = LRUCache(maxsize=128)
+
+# Funciones generadas para el motor "codegen", indexadas por el AFD (que es
+# compartido entre expresiones equivalentes).
+_python_cache = LRUCache(maxsize=128)
+
+
+class _Unobserved(Observer):
+    """(Interno) Observador por defecto: ejecuta las etapas sin medirlas."""
+
+    def stage(self, name, run, describe=None):
+        return run()
+
+
+_unobserved = _Unobserved()
+
+# Función de aceptación de cada proceso trabajador (ver match_many).
+_worker_accepts = None
+
+
+def _init_worker(engine, automaton):
+    """
+    (Interno) Prepara la función de aceptación del proceso trabajador a partir
+    del autómata ya compilado (o del patrón, para el motor "re").
+    """
+    global _worker_accepts
+    if engine == "re":
+        fullmatch = re.compile(automaton).fullmatch
+        _worker_accepts = lambda word: fullmatch(word) is not None
+    elif engine == "codegen":
+        _worker_accepts = automaton.compile_python()
+    else:
+        _worker_accepts = automaton.accepts
+
+
+def _match_chunk(words: List[str]) -> List[bool]:
+    """(Interno) Decide un tramo de cadenas en el proceso trabajador."""
+    return list(map(_worker_accepts, words))
+
+
+def _chunks(words: Iterable[str], size: int) -> Iterator[List[str]]:
+    """(Interno) Parte words en listas de (a lo sumo) size cadenas."""
+    words = iter(words)
+    chunk = list(islice(words, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(words, size))
+
+
+class CompiledRegEx:
+    """
+    Expresión regular compilada a un autómata. Se obtiene con
+    RegEx.compile(), que reutiliza las compilaciones previas de la misma
+    expresión; el autómata es compartido y no debe modificarse.
+
+    Con el motor "afd" (por defecto) se construye el AFD mínimo; con "afnd"
+    se simula el AFND directamente, lo que evita el costo (exponencial en el
+    peor caso) de determinizar a cambio de un match en O(len * estados); con
+    "codegen" se construye el AFD mínimo y se genera una función de Python con
+    sus transiciones escritas en el código (ver AFD.to_python); con "re" se
+    traduce la expresión a un patrón del módulo re (ver RegEx.to_re_pattern)
+    y se usa re.fullmatch, que recorre la cadena en C. El motor de re hace
+    backtracking, así que algunas expresiones (como (a*)*b) pueden tardar un
+    tiempo exponencial en el largo de la cadena; los motores de autómatas
+    son la referencia.
+
+    Si se da max_states y el AFD lo supera, se abandona su construcción y se
+    usa el motor "afnd" (también si se pidió "codegen"); fallback indica
+    entonces el motivo.
+
+    El AFD está en forma canónica (ver AFD.canonical) y se comparte entre
+    expresiones equivalentes, que tienen la misma huella (fingerprint).
+
+    Si se da un observer (ver regex.stats), se le notifica cada etapa de la
+    compilación con su tiempo, memoria y tamaños.
+    """
+
+    def __init__(self, regex, engine: str = "afd", max_states: Optional[int] = None,
+                 observer: Optional[Observer] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: {engine} (opciones: {', '.join(ENGINES)}).")
+        self.regex = regex
+        self.engine = engine
+        self.fallback = None
+        self.fingerprint = None
+        stage = (observer or _unobserved).stage
+        simplified = stage(
+            "simplify", regex.simplify,
+            lambda simplified: {"nodes": f"{regex.size()} -> {simplified.size()}"},
+        )
+        if engine == "re":
+            self.pattern = stage("to_re", simplified.to_re_pattern, lambda pattern: {"pattern": pattern})
+            self.automaton = None
+            fullmatch = re.compile(self.pattern).fullmatch
+            self._accepts = lambda word: fullmatch(word) is not None
+            return
+        if engine != "afnd":
+            try:
+                afd = stage("to_afd", lambda: simplified.to_afd(max_states), automaton_details)
+                afd = stage("minimize", lambda: afd.minimize_hopcroft().canonical(), automaton_details)
+                self.afd = stage("share", lambda: self._share(afd), lambda _: {"fingerprint": self.fingerprint[:12]})
+                self.automaton = self.afd
+                self._accepts = self.afd.accepts
+                if engine == "codegen":
+                    self._accepts = stage("codegen", self._generate)
+                return
+            except StateLimitExceeded as e:
+                self.engine = "afnd"
+                self.fallback = str(e)
+        self.afnd = stage("to_afnd", simplified.to_afnd, automaton_details)
+        self.automaton = self.afnd
+        self._accepts = self.afnd.accepts
+
+    def _share(self, afd):
+        """Devuelve el AFD compartido equivalente a afd, guardándolo si no hay uno."""
+        self.fingerprint = afd.fingerprint()
+        shared = _afd_cache.get(self.fingerprint)
+        if shared is not None and shared.equivalent(afd):
+            return shared
+        _afd_cache.put(self.fingerprint, afd)
+        return afd
+
+    def _generate(self):
+        """Devuelve la función generada para el AFD, reutilizando la de la caché."""
+        accepts = _python_cache.get(self.afd)
+        if accepts is None:
+            accepts = self.afd.compile_python()
+            _python_cache.put(self.afd, accepts)
+        return accepts
+
+    def match(self, word: str) -> bool:
+        """Indica si la expresión regular acepta la cadena dada."""
+        return self._accepts(word)
+
+    def matcher(self) -> Matcher:
+        """
+        Devuelve un matcher nuevo (ver automata.Matcher) para reconocer una
+        cadena que llega de a pedazos, sin armarla entera. El motor "re" no
+        lo permite: re.fullmatch necesita la cadena completa.
+        """
+        if self.engine == "re":
+            raise ValueError("El motor re no permite reconocer de a pedazos; usar afd, afnd o codegen.")
+        if self.engine == "afnd":
+            return AFNDMatcher(self.afnd)
+        return AFDMatcher(self.afd)
+
+    def match_parallel(self, word: str, processes: Optional[int] = None, chunks: Optional[int] = None) -> bool:
+        """
+        Indica si la expresión regular acepta una cadena muy larga, leyéndola
+        por tramos en paralelo (ver AFD.accepts_parallel). Solo los motores de
+        AFD lo permiten; con el resto se decide como en match.
+        """
+        if self.engine in ("afd", "codegen"):
+            return self.afd.accepts_parallel(word, processes, chunks)
+        return self.match(word)
+
+    def match_many(self, words: Iterable[str], processes: Optional[int] = None,
+                   chunksize: int = 4096) -> Iterator[bool]:
+        """
+        Indica, en orden y a medida que se consume, si la expresión regular
+        acepta cada cadena de words. La función de aceptación se resuelve una
+        única vez, no en cada cadena. Con processes > 1 las cadenas se reparten
+        en tramos de chunksize entre esa cantidad de procesos, a los que se
+        envía el autómata ya compilado; conviene sólo para lotes grandes.
+        """
+        if processes is None or processes <= 1:
+            return map(self._accepts, words)
+        return (match for _, matches in self._match_chunks(words, processes, chunksize) for match in matches)
+
+    def filter(self, words: Iterable[str], processes: Optional[int] = None,
+               chunksize: int = 4096) -> Iterator[str]:
+        """Devuelve, a medida que se consume, las cadenas de words que acepta la expresión (ver match_many)."""
+        if processes is None or processes <= 1:
+            return filter(self._accepts, words)
+        return (word for chunk, matches in self._match_chunks(words, processes, chunksize)
+                for word in compress(chunk, matches))
+
+    def _match_chunks(self, words, processes, chunksize):
+        """(Interno) Decide words por tramos en un pool de procesos; da pares (tramo, resultados)."""
+        # Se envía el autómata (o el patrón), no la expresión: los procesos no
+        # vuelven a compilarla.
+        automaton = self.pattern if self.engine == "re" else self.automaton
+        with Pool(processes, _init_worker, (self.engine, automaton)) as pool:
+            # Se mantienen a lo sumo dos tramos en vuelo por proceso, así no se
+            # consume todo words de antemano; los resultados salen en orden.
+            pending = deque()
+            for chunk in _chunks(words, chunksize):
+                pending.append((chunk, pool.apply_async(_match_chunk, (chunk,))))
+                if len(pending) > 2 * processes:
+                    chunk, result = pending.popleft()
+                    yield chunk, result.get()
+            while pending:
+                chunk, result = pending.popleft()
+                yield chunk, result.get()
+
+    def filter_async(self, source, chunk_size: int = 65536, encoding: str = "utf-8", errors: str = "strict"):
+        """
+        Versión asincrónica de filter para un asyncio.StreamReader o un
+        iterable asincrónico de líneas: devuelve un generador asincrónico de
+        las líneas aceptadas (ver regex.aio.filter_lines).
+        """
+        return filter_lines(self, source, chunk_size, encoding, errors)
+
+    def match_batch(self, words: Sequence[str]):
+        """
+        Indica, para cada cadena de words, si la expresión regular la acepta,
+        como un arreglo de bool de NumPy. Con los motores de AFD se avanzan
+        todas las cadenas a la vez (ver AFD.accepts_batch); con el resto se
+        decide cada una por separado.
+        """
+        if self.engine in ("afd", "codegen"):
+            return self.afd.accepts_batch(words)
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("match_batch requiere numpy (pip install numpy).") from e
+
+        return np.fromiter(map(self.match, words), dtype=bool, count=len(words))
+
+    def __str__(self):
+        return f"{self.__class__.__name__}<{self.regex}, {self.engine}>"
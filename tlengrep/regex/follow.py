@@ -0,0 +1,70 @@
+import os
+import time
+from typing import Callable, Iterator
+
+__all__ = ["follow"]
+
+# Cuánto se lee de una vez del archivo.
+CHUNK_SIZE = 1 << 16
+
+
+def follow(path: str, interval: float = 1.0, encoding: str = "utf-8",
+           sleep: Callable[[float], None] = time.sleep) -> Iterator[str]:
+    """
+    Devuelve las líneas de path (con su salto de línea) a medida que el
+    archivo crece, como tail -f pero desde el principio: cuando no hay datos
+    nuevos espera interval segundos y vuelve a mirar. Una línea incompleta al
+    final se guarda hasta que llega el resto, así cada línea se entrega una
+    única vez y entera.
+
+    Si el archivo se trunca (queda más corto que lo ya leído) se vuelve a leer
+    desde el principio, descartando la línea incompleta. Si se rota (path pasa
+    a ser otro archivo), se termina de leer el anterior, se entrega su última
+    línea aunque no tenga salto de línea y se sigue con el nuevo desde el
+    principio; mientras path no exista se sigue esperando sobre el anterior.
+
+    Las líneas se leen como bytes y se decodifican enteras, reemplazando los
+    bytes inválidos en lugar de fallar. No termina nunca: se corta dejando de
+    consumirlo.
+    """
+    file = open(path, "rb")
+    try:
+        pieces = []
+        while True:
+            data = file.read(CHUNK_SIZE)
+            if data:
+                *lines, rest = data.split(b"\n")
+                if lines:
+                    lines[0] = b"".join(pieces) + lines[0]
+                    pieces = []
+                    for line in lines:
+                        yield (line + b"\n").decode(encoding, "replace")
+                if rest:
+                    pieces.append(rest)
+                continue
+
+            opened = os.fstat(file.fileno())
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+            if current is not None and (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+                # Rotado: lo que quedaba del anterior ya se leyó.
+                if pieces:
+                    yield b"".join(pieces).decode(encoding, "replace")
+                    pieces = []
+                try:
+                    rotated = open(path, "rb")
+                except FileNotFoundError:
+                    sleep(interval)
+                    continue
+                file.close()
+                file = rotated
+            elif opened.st_size < file.tell():
+                # Truncado.
+                file.seek(0)
+                pieces = []
+            else:
+                sleep(interval)
+    finally:
+        file.close()
@@ -0,0 +1,87 @@
+import sys
+import time
+from collections import defaultdict
+from os.path import basename
+from typing import Dict, Tuple
+
+__all__ = ["Profiler"]
+
+
+def _label(frame, event, arg) -> str:
+    """Nombre de una función en la pila, sin ';' (que separa los marcos)."""
+    if event.startswith("c_"):
+        module = getattr(arg, "__module__", None) or "builtins"
+        name = f"{module}.{getattr(arg, '__qualname__', repr(arg))}"
+    else:
+        code = frame.f_code
+        name = f"{code.co_name} ({basename(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ",")
+
+
+class Profiler:
+    """
+    Perfilador determinístico (con sys.setprofile) que acumula el tiempo
+    propio de cada pila de llamadas y lo escribe en formato de pilas
+    colapsadas ("marco;marco;marco microsegundos" por línea), que leen las
+    herramientas de flame graphs (flamegraph.pl, speedscope, inferno...).
+
+    Se perfila por secciones: cada pila empieza con el nombre de la sección
+    en la que se ejecutó, así las de compilación y las de matching quedan
+    separadas en el gráfico.
+    """
+
+    def __init__(self):
+        self.stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._section = None
+        self._stack = []
+
+    def section(self, name: str) -> "Profiler":
+        """Perfila el bloque with dentro de la sección dada."""
+        self._section = name
+        return self
+
+    def __enter__(self):
+        # Cada marco de _stack es [nombre, inicio, tiempo en llamadas hijas].
+        self._stack = [[self._section, time.perf_counter(), 0.0]]
+        sys.setprofile(self._event)
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.setprofile(None)
+        now = time.perf_counter()
+        while self._stack:
+            self._pop(now)
+
+    def _event(self, frame, event, arg):
+        now = time.perf_counter()
+        if frame.f_code.co_filename == __file__:
+            # Las llamadas del propio perfilador (como __exit__) no se miden.
+            return
+        if event in ("call", "c_call"):
+            self._stack.append([_label(frame, event, arg), now, 0.0])
+        elif len(self._stack) > 1:
+            # Los retornos de marcos que empezaron antes de la sección no
+            # tienen entrada, y se ignoran.
+            self._pop(now)
+
+    def _pop(self, now: float):
+        stack = tuple(name for name, _, _ in self._stack)
+        _, start, children = self._stack.pop()
+        elapsed = now - start
+        self.stacks[stack] += elapsed - children
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def collapsed(self) -> str:
+        """Devuelve las pilas colapsadas, con el tiempo propio en microsegundos."""
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds > 0:
+                lines.append(f"{';'.join(stack)} {microseconds}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Escribe las pilas colapsadas en el archivo dado."""
+        with open(path, "w") as f:
+            f.write(self.collapsed())
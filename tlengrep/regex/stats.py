@@ -0,0 +1,110 @@
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from tabulate import tabulate
+
+__all__ = ["StageStats", "Observer", "Statistics", "automaton_details"]
+
+
+class StageStats:
+    """
+    Estadísticas de una etapa: tiempo, pico de memoria (None si no se midió)
+    y detalles propios.
+    """
+
+    __slots__ = ("name", "seconds", "peak_bytes", "details")
+
+    def __init__(self, name: str, seconds: float, peak_bytes: Optional[int], details: Dict[str, Any]):
+        self.name = name
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.details = details
+
+    def __repr__(self):
+        peak = "-" if self.peak_bytes is None else f"{self.peak_bytes}B"
+        return f"{self.__class__.__name__}<{self.name}, {self.seconds:.6f}s, {peak}, {self.details}>"
+
+
+class Observer:
+    """
+    Observador de las etapas de compilación (ver RegEx.compile). Cada etapa
+    se ejecuta con stage(), que la mide y llama a on_stage con el resultado;
+    las subclases redefinen on_stage.
+    """
+
+    def on_stage(self, stats: StageStats):
+        pass
+
+    def stage(self, name: str, run: Callable[[], Any],
+              describe: Optional[Callable[[Any], Dict[str, Any]]] = None, memory: bool = True) -> Any:
+        """
+        Ejecuta run() midiendo su tiempo y su pico de memoria (con
+        tracemalloc), y notifica la etapa. describe, si se da, arma los
+        detalles a partir del resultado. Devuelve el resultado de run(); si
+        run() lanza una excepción, se notifica la etapa con el error y se
+        vuelve a lanzar.
+
+        Con memory=False no se usa tracemalloc, que hace más lenta toda
+        asignación: el tiempo medido es el real y el pico queda en None.
+        """
+        tracing = memory and tracemalloc.is_tracing()
+        if memory:
+            if not tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        error = None
+        try:
+            result = run()
+        except Exception as e:
+            error = e
+        seconds = time.perf_counter() - start
+        peak_bytes = None
+        if memory:
+            _, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            peak_bytes = peak - before
+
+        if error is not None:
+            # La etapa se notifica igual, con el error como detalle.
+            self.on_stage(StageStats(name, seconds, peak_bytes, {"error": str(error)}))
+            raise error
+        details = describe(result) if describe is not None else {}
+        self.on_stage(StageStats(name, seconds, peak_bytes, details))
+        return result
+
+
+class Statistics(Observer):
+    """Observador que guarda las estadísticas de cada etapa, en orden."""
+
+    def __init__(self):
+        self.stages: List[StageStats] = []
+
+    def on_stage(self, stats: StageStats):
+        self.stages.append(stats)
+
+    def table(self) -> str:
+        """Genera una tabla con las estadísticas de las etapas."""
+        header = ["Etapa", "Tiempo (ms)", "Memoria pico (KiB)", "Detalles"]
+        rows = [
+            [
+                stats.name,
+                f"{stats.seconds * 1000:.3f}",
+                "-" if stats.peak_bytes is None else f"{stats.peak_bytes / 1024:.1f}",
+                ", ".join(f"{key}: {value}" for key, value in stats.details.items()),
+            ]
+            for stats in self.stages
+        ]
+        return tabulate(rows, header, tablefmt="fancy_grid")
+
+
+def automaton_details(automaton) -> Dict[str, Any]:
+    """Detalles de un autómata: estados, transiciones y tamaño del alfabeto."""
+    return {
+        "states": automaton.size(),
+        "transitions": automaton.transitions_count(),
+        "alphabet": len(automaton.alphabet),
+    }
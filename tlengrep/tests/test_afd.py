@@ -0,0 +1,113 @@
+import itertools
+
+import pytest
+
+from automata import AFD
+from parse_regex import parse_regex
+
+patterns = ['(ab)*', 'a*b', '(a|b)*a', '[a-c]+', 'a?b?c?', 'abc|cab']
+pairs = list(itertools.permutations(patterns, 2))
+
+
+class TestBooleanOperations:
+    @pytest.mark.parametrize("pattern1,pattern2", pairs)
+    def test_intersection(self, pattern1, pattern2, strings):
+        '''La intersección acepta las cadenas que aceptan ambas expresiones'''
+        regex1, regex2 = parse_regex(pattern1), parse_regex(pattern2)
+        afd = regex1.compile().afd.intersection(regex2.compile().afd)
+        for string in strings:
+            assert afd.accepts(string) == (regex1.match(string) and regex2.match(string)), f"'{pattern1}' y '{pattern2}' difieren en la cadena '{string}'"
+
+    @pytest.mark.parametrize("pattern1,pattern2", pairs)
+    def test_difference(self, pattern1, pattern2, strings):
+        '''La diferencia acepta las cadenas de la primera expresión que no acepta la segunda'''
+        regex1, regex2 = parse_regex(pattern1), parse_regex(pattern2)
+        afd = regex1.compile().afd.difference(regex2.compile().afd)
+        for string in strings:
+            assert afd.accepts(string) == (regex1.match(string) and not regex2.match(string)), f"'{pattern1}' menos '{pattern2}' difiere en la cadena '{string}'"
+
+    @pytest.mark.parametrize("pattern", patterns)
+    def test_complement(self, pattern, strings):
+        '''El complemento acepta las cadenas sobre el alfabeto que la expresión no acepta'''
+        regex = parse_regex(pattern)
+        alphabet = set('abc')
+        afd = regex.to_afd().complement(alphabet)
+        assert afd.alphabet == alphabet
+        for string in strings:
+            expected = set(string) <= alphabet and not regex.match(string)
+            assert afd.accepts(string) == expected, f"El complemento de '{pattern}' difiere en la cadena '{string}'"
+
+    def test_prunes_dead_pairs(self):
+        '''Los pares desde los que no se puede aceptar se juntan en un estado'''
+        afd1 = AFD().add_state(0).add_state(1, final=True).mark_initial_state(0)
+        afd1.add_transition(0, 1, 'a').add_transition(1, 1, 'a')
+        afd2 = AFD().add_state(0).add_state(1, final=True).mark_initial_state(0)
+        afd2.add_transition(0, 1, 'b').add_transition(1, 1, 'a')
+        # Desde (0, 0) con a o b uno de los dos no tiene transición.
+        assert afd1.intersection(afd2).size() == 2
+        assert afd1.difference(afd2).size() == 3
+
+
+class TestCanonical:
+    @pytest.mark.parametrize("pattern1,pattern2", [
+        ('(ab)*', '(((ab)*)*)*'),
+        ('a|b', '[ab]'),
+        ('(a|b)*', '(a*b*)*'),
+        ('aa*', 'a+'),
+    ])
+    def test_equivalent_patterns(self, pattern1, pattern2):
+        '''Las expresiones equivalentes tienen la misma huella'''
+        afd1 = parse_regex(pattern1).to_afd().minimize_hopcroft()
+        afd2 = parse_regex(pattern2).to_afnd().determinize().minimize()
+        assert afd1.canonical().transitions == afd2.canonical().transitions
+        assert afd1.fingerprint() == afd2.fingerprint()
+        assert afd1.equivalent(afd2) and afd2.equivalent(afd1)
+
+    @pytest.mark.parametrize("pattern1,pattern2", pairs)
+    def test_different_patterns(self, pattern1, pattern2):
+        '''Las expresiones no equivalentes se distinguen'''
+        afd1 = parse_regex(pattern1).to_afd()
+        afd2 = parse_regex(pattern2).to_afd()
+        assert afd1.minimize_hopcroft().fingerprint() != afd2.minimize_hopcroft().fingerprint()
+        assert not afd1.equivalent(afd2)
+
+    def test_equivalent_not_minimal(self):
+        '''La equivalencia no requiere autómatas mínimos ni completos'''
+        afd1 = parse_regex('(ab)*').to_afnd().determinize()
+        afd2 = AFD().add_state(0, final=True).add_state(1).mark_initial_state(0)
+        afd2.add_transition(0, 1, 'a').add_transition(1, 0, 'b')
+        assert afd1.equivalent(afd2) and afd2.equivalent(afd1)
+        afd2.add_transition(1, 1, 'a')
+        assert not afd1.equivalent(afd2)
+
+
+class TestStateMapping:
+    @pytest.mark.parametrize("pattern", patterns)
+    def test_composition(self, pattern, strings):
+        '''Componer las funciones de estados de los tramos equivale a leer la cadena entera'''
+        afd = parse_regex(pattern).compile().afd
+        for string in strings:
+            for cut in {0, len(string) // 3, len(string)}:
+                first = afd.state_mapping(string[:cut], [afd.initial_state])
+                second = afd.state_mapping(string[cut:])
+                assert set(second) == afd.states
+                state = second[first[afd.initial_state]] if first[afd.initial_state] is not None else None
+                assert (state in afd.final_states) == afd.accepts(string), f"'{pattern}' difiere en la cadena '{string}' partida en {cut}"
+
+    def test_missing_transitions(self):
+        '''Los estados sin transición para algún caracter van a None'''
+        afd = AFD()
+        afd.add_state(0, final=True)
+        afd.add_state(1)
+        afd.add_transition(0, 1, 'a')
+        afd.add_transition(1, 0, 'b')
+        assert afd.state_mapping("ab") == {0: 0, 1: None}
+        assert afd.state_mapping("b") == {0: None, 1: 0}
+        assert afd.state_mapping("") == {0: 0, 1: 1}
+
+    @pytest.mark.parametrize("engine", ["afd", "codegen", "afnd"])
+    def test_parallel(self, engine):
+        '''Leer por tramos en varios procesos da el mismo resultado'''
+        compiled = parse_regex('(ab|b)*a?').compile(engine)
+        for word in ["", "a", "ab" * 50 + "b", "ab" * 50 + "aa", "b" * 31 + "a"]:
+            assert compiled.match_parallel(word, processes=2, chunks=5) == compiled.match(word)
@@ -0,0 +1,88 @@
+import pytest
+
+from automata import AFND, StateLimitExceeded
+from automata.afnd import SpecialSymbol
+
+
+def lambda_cycle():
+    '''q0 -λ-> q1 -λ-> q2 -λ-> q0, q2 -λ-> q3 y q3 -a-> q4'''
+    afnd = AFND()
+    for state in range(5):
+        afnd.add_state(f"q{state}", final=state == 4)
+    afnd.mark_initial_state("q0")
+    for org, dest in [(0, 1), (1, 2), (2, 0), (2, 3)]:
+        afnd.add_transition(f"q{org}", f"q{dest}", SpecialSymbol.Lambda)
+    afnd.add_transition("q3", "q4", "a")
+    return afnd
+
+
+class TestLambdaClosure:
+    def test_cycle(self):
+        '''Los estados de un ciclo lambda comparten su clausura'''
+        afnd = lambda_cycle()
+        expected = {"q0", "q1", "q2", "q3"}
+        for state in ["q0", "q1", "q2"]:
+            assert afnd._l_closure({state}) == expected
+        assert afnd._l_closure({"q3"}) == {"q3"}
+        assert afnd._l_closure({"q4"}) == {"q4"}
+
+    def test_invalidated_by_add_transition(self):
+        '''Agregar una transición lambda actualiza las clausuras'''
+        afnd = lambda_cycle()
+        assert afnd._l_closure({"q3"}) == {"q3"}
+        afnd.add_transition("q3", "q4", SpecialSymbol.Lambda)
+        assert afnd._l_closure({"q3"}) == {"q3", "q4"}
+        assert afnd._l_closure({"q1"}) == {"q0", "q1", "q2", "q3", "q4"}
+
+    def test_invalidated_by_rename(self):
+        '''Renombrar los estados actualiza las clausuras'''
+        afnd = lambda_cycle()
+        afnd._l_closure({"q0"})
+        afnd.add_prefix("p")
+        assert afnd._l_closure({"pq3"}) == {"pq3"}
+        assert afnd._l_closure({"pq2"}) == {"pq0", "pq1", "pq2", "pq3"}
+
+    def test_accepts_after_changing_initial_and_finals(self):
+        '''Cambiar el estado inicial o los finales después de simular se tiene en cuenta'''
+        afnd = lambda_cycle()
+        assert afnd.accepts("a") and not afnd.accepts("")
+        afnd.mark_initial_state("q4")
+        assert afnd.accepts("") and not afnd.accepts("a")
+        afnd.final_states.discard("q4")
+        assert not afnd.accepts("")
+        afnd.final_states = {"q4", "q0"}
+        afnd.mark_initial_state("q1")
+        assert afnd.accepts("") and afnd.accepts("a")
+
+    def test_determinize(self):
+        '''El AFD usa las clausuras del ciclo'''
+        afd = lambda_cycle().determinize()
+        assert afd.accepts("a")
+        assert not afd.accepts("")
+        assert not afd.accepts("aa")
+
+    def test_determinize_state_limit(self):
+        '''Determinizar con un límite de estados menor lanza una excepción'''
+        with pytest.raises(StateLimitExceeded):
+            lambda_cycle().determinize(max_states=2)
+        assert lambda_cycle().determinize(max_states=3).size() == 3
+
+
+class TestNormalizeStates:
+    def test_afnd(self):
+        '''Los estados se renumeran desde el inicial y se conservan las transiciones'''
+        afnd = lambda_cycle()
+        afnd.mark_initial_state("q3")
+        afnd.normalize_states()
+        assert afnd.states == set(range(5))
+        assert afnd.initial_state == 0
+        assert afnd.transitions[0]["a"] == afnd.final_states
+        assert afnd.determinize().accepts("a")
+
+    def test_afd(self):
+        '''Renumerar un AFD no cambia el lenguaje y se muestra como q0, q1, ...'''
+        afd = lambda_cycle().determinize().minimize_hopcroft()
+        afd.normalize_states()
+        assert afd.states == set(range(afd.size()))
+        assert afd.accepts("a") and not afd.accepts("aa")
+        assert "q0" in afd.transitions_table()
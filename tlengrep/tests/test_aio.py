@@ -0,0 +1,102 @@
+import asyncio
+import socket
+
+import pytest
+
+from regex import Char, Concat, Plus, Star, Union
+
+# (ab|ñ)*c+
+regex = Concat(Star(Union(Concat(Char('a'), Char('b')), Char('ñ'))), Plus(Char('c')))
+lines = ["c", "abñc", "", "ab", "ñññcc", "x" * 50, "ab" * 40 + "c", "abc"]
+
+
+def expected(lines):
+    return [line for line in lines if regex.match(line)]
+
+
+async def collect(iterator):
+    return [line async for line in iterator]
+
+
+async def filter_socket(compiled, data: bytes, chunk_size: int):
+    """Envía data por un extremo de un par de sockets y filtra lo que llega al otro."""
+    ours, theirs = socket.socketpair()
+    theirs.setblocking(False)
+    reader, writer = await asyncio.open_connection(sock=ours)
+
+    async def send():
+        await asyncio.get_running_loop().sock_sendall(theirs, data)
+        theirs.close()
+
+    sender = asyncio.create_task(send())
+    try:
+        return await collect(compiled.filter_async(reader, chunk_size=chunk_size))
+    finally:
+        await sender
+        writer.close()
+
+
+async def async_lines(lines, consumed=None):
+    for line in lines:
+        if consumed is not None:
+            consumed.append(line)
+        yield line
+
+
+class TestFilterAsync:
+    @pytest.mark.parametrize("engine", ["afd", "afnd", "codegen", "re"])
+    @pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+    def test_stream_reader(self, engine, chunk_size):
+        '''Filtra las líneas que llegan por un socket, aunque se corten en cualquier lugar'''
+        compiled = regex.compile(engine)
+        for data in ["\n".join(lines) + "\n", "\n".join(lines), "", "\n\n"]:
+            result = asyncio.run(filter_socket(compiled, data.encode(), chunk_size))
+            assert result == expected(data.split("\n")[:-1] if data.endswith("\n") else data.split("\n")), data
+
+    @pytest.mark.parametrize("engine", ["afd", "afnd", "re"])
+    def test_async_iterable(self, engine):
+        '''Filtra un iterable asincrónico de líneas, con o sin salto de línea y como str o bytes'''
+        compiled = regex.compile(engine)
+        source = [line + "\n" for line in lines[:4]] + [line.encode() for line in lines[4:]]
+        assert asyncio.run(collect(compiled.filter_async(async_lines(source), chunk_size=7))) == expected(lines)
+
+    def test_long_line_yields(self):
+        '''Una línea larga se procesa por lotes sin bloquear el event loop'''
+        compiled = regex.compile()
+
+        async def run():
+            ticks = 0
+            done = False
+
+            async def tick():
+                nonlocal ticks
+                while not done:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.create_task(tick())
+            await asyncio.sleep(0)
+            result = await collect(compiled.filter_async(async_lines(["ab" * 5000 + "c"]), chunk_size=100))
+            done = True
+            await ticker
+            return result, ticks
+
+        result, ticks = asyncio.run(run())
+        assert result == ["ab" * 5000 + "c"]
+        assert ticks >= 100
+
+    def test_backpressure(self):
+        '''Solo se lee de la fuente a medida que se piden líneas'''
+        compiled = regex.compile()
+        source = ["c"] * 1000
+
+        async def run():
+            consumed = []
+            matches = compiled.filter_async(async_lines(source, consumed), chunk_size=16)
+            first = await matches.__anext__()
+            await matches.aclose()
+            return first, consumed
+
+        first, consumed = asyncio.run(run())
+        assert first == "c"
+        assert len(consumed) < 20
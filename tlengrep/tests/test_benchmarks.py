@@ -0,0 +1,29 @@
+from benchmarks import compare, run
+
+
+class TestBenchmarks:
+    def test_run(self):
+        '''Se mide cada etapa de cada expresión por separado'''
+        rows = run(["exp1"], repeat=1)
+        stages = {row["stage"] for row in rows}
+        assert stages == {"parse", "to_afnd", "determinize", "to_afd", "minimize",
+                          "minimize_hopcroft", "codegen", "accepts", "generated", "re", "simulate"}
+        assert {row["regex"] for row in rows} == {"(ab)*", "(((ab)*)*)*"}
+        assert all(row["time (ms)"] >= 0 for row in rows)
+
+    def test_exp3_naive(self):
+        '''El experimento 3 mide naive_match con sus propias expresiones'''
+        rows = run(["exp3"], repeat=1)
+        assert "naive" in {row["stage"] for row in rows}
+        assert {row["regex"] for row in rows}.isdisjoint({"(ab)*", "(((ab)*)*)*"})
+
+    def test_compare(self):
+        '''Se reportan las mediciones más lentas que la línea de base'''
+        def row(stage, elapsed):
+            return {"benchmark": "exp1", "regex": "(ab)*", "stage": stage,
+                    "instance size": "", "time (ms)": elapsed}
+
+        baseline = [row("to_afnd", "10.0"), row("determinize", "10.0"), row("minimize", "0.1")]
+        rows = [row("to_afnd", 12.0), row("determinize", 20.0), row("minimize", 0.5), row("parse", 50.0)]
+        regressions = compare(rows, baseline, threshold=1.5)
+        assert [(row["stage"], base, ratio) for row, base, ratio in regressions] == [("determinize", 10.0, 2.0)]
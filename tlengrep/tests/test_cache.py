@@ -0,0 +1,131 @@
+import os
+import pickle
+import subprocess
+import sys
+
+from parse_regex import parse_regex
+from regex import Char, Concat, Star, Union, RegClass
+from regex.cache import LRUCache
+
+
+class TestInterning:
+    def test_equal_subexpressions_are_shared(self):
+        '''Dos expresiones construidas por separado son la misma instancia'''
+        regex1 = Star(Concat(Char('a'), Char('b')))
+        regex2 = Star(Concat(Char('a'), Char('b')))
+        assert regex1 is regex2
+        assert regex1 == regex2
+        assert hash(regex1) == hash(regex2)
+
+    def test_different_expressions(self):
+        '''Expresiones distintas no son iguales'''
+        assert Concat(Char('a'), Char('b')) != Concat(Char('b'), Char('a'))
+        assert Union(Char('a'), Char('b')) != Concat(Char('a'), Char('b'))
+
+    def test_shared_subtrees(self):
+        '''Los subárboles repetidos se guardan una sola vez'''
+        regex = parse_regex('(ab)|(ab)c')
+        assert regex.exps[0] is regex.exps[1].exps[0]
+
+    def test_reg_class(self):
+        '''Las clases se comparan por su conjunto de caracteres'''
+        assert RegClass({'a', 'b'}) is RegClass({'b', 'a'})
+
+    def test_reg_class_copies_chars(self):
+        '''Cambiar el conjunto con el que se construyó una clase no la modifica'''
+        chars = {'a', 'b'}
+        regex = RegClass(chars)
+        chars.add('c')
+        assert regex.chars == {'a', 'b'}
+        assert regex is RegClass({'a', 'b'})
+        assert regex.match('a') and not regex.match('c')
+
+    def test_keyword_arguments(self):
+        '''Los constructores aceptan sus argumentos por nombre'''
+        assert Char(char='a') is Char('a')
+        assert RegClass(chars={'a'}) is RegClass({'a'})
+        assert Star(exp=Char('a')) is Star(Char('a'))
+
+    def test_hash_independent_of_seed(self):
+        '''El hash y el orden de las uniones simplificadas no dependen de PYTHONHASHSEED'''
+        code = (
+            "from parse_regex import parse_regex; "
+            "regex = parse_regex('(ñb|a|[xyz]c|λ)*d|bc'); "
+            "print(hash(regex), regex.simplify().to_re_pattern())"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                env={**os.environ, "PYTHONHASHSEED": seed, "PYTHONPATH": os.pathsep.join(sys.path)},
+            ).stdout
+            for seed in ("0", "1", "12345")
+        }
+        assert len(outputs) == 1
+
+    def test_pickle(self):
+        '''Una expresión deserializada vuelve a la tabla de expresiones'''
+        regex = parse_regex('(a|b)*c')
+        assert pickle.loads(pickle.dumps(regex)) is regex
+
+    def test_pickle_deep(self):
+        '''Serializar una expresión muy anidada no depende del límite de recursión'''
+        regex = Char('a')
+        for _ in range(3000):
+            regex = Star(Concat(regex, Char('b')))
+        assert pickle.loads(pickle.dumps(regex)) is regex
+
+
+class TestCompileCache:
+    def test_parse_regex_cached(self):
+        '''Parsear dos veces el mismo patrón devuelve la misma expresión'''
+        assert parse_regex('(abc)+d') is parse_regex('(abc)+d')
+
+    def test_compile_cached(self):
+        '''Compilar dos veces la misma expresión reutiliza el autómata'''
+        compiled = parse_regex('x(yz)*').compile()
+        assert Concat(Char('x'), Star(Concat(Char('y'), Char('z')))).compile() is compiled
+
+    def test_compile_cached_per_engine(self):
+        '''Cada motor tiene su propia compilación'''
+        regex = parse_regex('x(yz)*')
+        assert regex.compile('afnd') is regex.compile('afnd')
+        assert regex.compile('afnd') is not regex.compile('afd')
+
+    def test_equivalent_share_afd(self):
+        '''Las expresiones equivalentes comparten el AFD'''
+        compiled1 = parse_regex('(x|y)*').compile()
+        compiled2 = parse_regex('(x*y*)*').compile()
+        assert compiled1 is not compiled2
+        assert compiled1.fingerprint == compiled2.fingerprint
+        assert compiled1.afd is compiled2.afd
+        assert parse_regex('(x|y)+').compile().afd is not compiled1.afd
+
+    def test_state_limit_fallback(self):
+        '''Si el AFD supera el límite de estados se simula el AFND'''
+        regex = parse_regex('(a|b)*a(a|b)(a|b)(a|b)')
+        compiled = regex.compile(max_states=8)
+        assert compiled.engine == 'afnd'
+        assert compiled.fallback is not None
+        for word in ['abbb', 'baaa', 'aaaaa', 'aab', '']:
+            assert compiled.match(word) == regex.compile().match(word)
+        assert regex.compile(max_states=16).engine == 'afd'
+
+
+class TestLRUCache:
+    def test_get_put(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('b', 2) == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1).put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert len(cache) == 2
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from regex import follow as follow_module
+from regex.follow import follow
+
+
+class Done(Exception):
+    pass
+
+
+def run(path, actions):
+    """
+    Sigue path y devuelve las líneas leídas; cada vez que follow espera se
+    ejecuta la siguiente acción, y cuando no quedan se termina.
+    """
+    actions = iter(actions)
+
+    def sleep(interval):
+        action = next(actions, None)
+        if action is None:
+            raise Done
+        action()
+
+    lines = []
+    with pytest.raises(Done):
+        for line in follow(str(path), sleep=sleep):
+            lines.append(line)
+    return lines
+
+
+def append(path, data):
+    def action():
+        with open(path, "ab") as file:
+            file.write(data)
+    return action
+
+
+def write(path, data):
+    def action():
+        with open(path, "wb") as file:
+            file.write(data)
+    return action
+
+
+class TestFollow:
+    def test_growing_file(self, tmp_path):
+        '''Las líneas nuevas se entregan una vez y enteras, aunque lleguen partidas'''
+        path = tmp_path / "log"
+        path.write_bytes(b"uno\ndo")
+        lines = run(path, [append(path, b"s\ntr"), append(path, b"es"), append(path, b"\n\xc3"), append(path, b"\xb1\n")])
+        assert lines == ["uno\n", "dos\n", "tres\n", "ñ\n"]
+
+    def test_long_line(self, tmp_path, monkeypatch):
+        '''Una línea más larga que lo que se lee de una vez se junta entera'''
+        monkeypatch.setattr(follow_module, "CHUNK_SIZE", 4)
+        path = tmp_path / "log"
+        path.write_bytes(b"a" * 10 + b"\nb\n")
+        assert run(path, []) == ["a" * 10 + "\n", "b\n"]
+
+    def test_truncation(self, tmp_path):
+        '''Si el archivo se trunca se vuelve a leer desde el principio'''
+        path = tmp_path / "log"
+        path.write_bytes(b"uno\ndos\npartial")
+        lines = run(path, [write(path, b"tres\n")])
+        assert lines == ["uno\n", "dos\n", "tres\n"]
+
+    def test_rotation(self, tmp_path):
+        '''Si el archivo se rota se termina el anterior y se sigue con el nuevo'''
+        path = tmp_path / "log"
+        path.write_bytes(b"uno\n")
+
+        def rotate():
+            with open(path, "ab") as file:
+                file.write(b"dos\nsin fin")
+            os.rename(path, tmp_path / "log.1")
+
+        lines = run(path, [rotate, lambda: None, write(path, b"tres\n"), append(path, b"cuatro\n")])
+        assert lines == ["uno\n", "dos\n", "sin fin", "tres\n", "cuatro\n"]
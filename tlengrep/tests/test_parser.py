@@ -279,3 +279,31 @@ class TestParser:
         else:
             with pytest.raises(SyntaxError):
                 parse_regex(case["text"])
+
+
+class TestLongPatterns:
+    '''Los patrones largos no dependen del límite de recursión'''
+
+    def test_long_literal(self):
+        text = 'ab' * 5000
+        regex = parse_regex(text)
+        assert str(regex) == text
+        assert regex.size() == len(text) + 1
+        assert regex.to_afnd().size() == 2 * len(text)
+        assert regex.naive_match(text)
+        assert not regex.naive_match(text[:-1])
+
+    def test_many_alternatives(self):
+        words = [f'w{i}' for i in range(20000)]
+        regex = parse_regex('|'.join(words))
+        assert len(regex.exps) == len(words)
+        assert str(regex) == '|'.join(f'({word})' for word in words)
+        assert regex.simplify().size() <= regex.size()
+        assert regex.to_afnd().size() == 1 + sum(2 * len(word) for word in words)
+        assert regex.naive_match('w19999')
+        assert not regex.naive_match('w20000')
+
+    def test_long_class(self):
+        chars = [chr(code) for code in range(0x100, 0x100 + 20000)]
+        regex = parse_regex('[' + ''.join(chars) + ']')
+        assert regex.chars == set(chars)
@@ -0,0 +1,33 @@
+import re
+
+from parse_regex import parse_regex
+from regex.profiler import Profiler
+
+
+class TestProfiler:
+    def test_sections(self):
+        '''Las pilas de cada sección empiezan con su nombre'''
+        profiler = Profiler()
+        with profiler.section("compile"):
+            compiled = parse_regex('(ab)*c').compile(engine="afnd")
+        with profiler.section("match"):
+            for _ in range(10):
+                compiled.match('ab' * 20 + 'c')
+
+        stacks = [stack for stack in profiler.stacks if profiler.stacks[stack] > 0]
+        assert {stack[0] for stack in stacks} == {"compile", "match"}
+        assert any("accepts (afnd.py" in frame for stack in stacks if stack[0] == "match" for frame in stack)
+        assert not any("profiler.py" in frame for stack in stacks for frame in stack)
+
+    def test_collapsed_format(self, tmp_path):
+        '''La salida tiene una pila separada por ';' y un entero por línea'''
+        profiler = Profiler()
+        with profiler.section("match"):
+            sorted([3, 1, 2])
+            parse_regex('x|y').match('x')
+        path = tmp_path / "profile.folded"
+        profiler.write(str(path))
+        lines = path.read_text().splitlines()
+        assert lines
+        for line in lines:
+            assert re.fullmatch(r"match(;[^;]+)* \d+", line), line
@@ -1,9 +1,14 @@
 from os.path import dirname, basename, join
+import copy
 import glob
 import importlib
+import itertools
 import pytest
 import re
 
+from regex import Char, Concat, Empty, Lambda, Plus, RegClass, Star, Union
+from regex.arena import RegExArena
+
 # Setup: Genera los casos de test a partir de los archivos en tests/regexes/*.py
 case_names = [
     basename(filename)[:-3]
@@ -38,6 +43,129 @@ class TestRegex:
                 should_match = case["should_match"](string)
             assert does_match == should_match, f"La regex '{case['regex']}' {'no acepta' if should_match else 'acepta'} la cadena '{string}'"
 
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_naive_match(self, case, strings):
+        '''La implementación naive acepta las mismas cadenas'''
+        regex = case["regex"]
+        for string in strings:
+            assert regex.naive_match(string) == regex.match(string), f"La regex '{case['regex']}' difiere entre naive_match y match para la cadena '{string}'"
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_simplify(self, case, strings):
+        '''La expresión simplificada no crece y acepta las mismas cadenas'''
+        regex = case["regex"]
+        simplified = regex.simplify()
+        assert simplified.size() <= regex.size(), f"La simplificación de '{regex}' tiene más nodos: '{simplified}'"
+        for string in strings:
+            assert simplified.naive_match(string) == regex.naive_match(string), f"La regex '{regex}' simplificada como '{simplified}' difiere en la cadena '{string}'"
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_arena(self, case, strings):
+        '''La forma de arena reconstruye la misma expresión'''
+        regex = case["regex"]
+        arena = RegExArena.from_regex(regex)
+        assert arena.to_regex() is regex
+        assert str(arena) == str(regex)
+        for string in strings:
+            assert arena.match(string) == regex.match(string)
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_followpos(self, case, strings):
+        '''El AFD construido por followpos acepta las mismas cadenas y tiene el mismo mínimo'''
+        regex = case["regex"]
+        afd = regex.to_afd()
+        for string in strings:
+            assert afd.accepts(string) == regex.match(string), f"El AFD por followpos de '{regex}' difiere en la cadena '{string}'"
+        assert afd.minimize().size() == case["min_afnd_size"]
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_determinize(self, case, strings):
+        '''El AFND determinizado es completo y acepta las mismas cadenas'''
+        regex = case["regex"]
+        afd = regex.to_afnd().determinize()
+        for state in afd.states:
+            assert afd.transitions[state].keys() == afd.alphabet
+        for string in strings:
+            assert afd.accepts(string) == regex.match(string), f"El AFD determinizado de '{regex}' difiere en la cadena '{string}'"
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_afnd_engine(self, case, strings):
+        '''La simulación del AFND acepta las mismas cadenas'''
+        regex = case["regex"]
+        compiled = regex.compile("afnd")
+        for string in strings:
+            assert compiled.match(string) == regex.match(string), f"La simulación del AFND de '{regex}' difiere en la cadena '{string}'"
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_codegen_engine(self, case, strings):
+        '''La función generada a partir del AFD acepta las mismas cadenas'''
+        regex = case["regex"]
+        compiled = regex.compile("codegen")
+        for string in strings:
+            assert compiled.match(string) == regex.match(string), f"El código generado para '{regex}' difiere en la cadena '{string}'"
+        # También sobre un AFD sin minimizar, con estados que no son números.
+        accepts = regex.to_afnd().determinize().minimize_hopcroft().compile_python()
+        for string in strings:
+            assert accepts(string) == regex.match(string)
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_re_engine(self, case, strings):
+        '''El patrón de re traducido acepta las mismas cadenas que el AFD'''
+        regex = case["regex"]
+        compiled = regex.compile("re")
+        reference = regex.compile("afd")
+        for string in strings:
+            assert compiled.match(string) == reference.match(string), f"El patrón de re '{compiled.pattern}' de '{regex}' difiere en la cadena '{string}'"
+        # Sin simplificar, para traducir todos los tipos de nodos.
+        pattern = re.compile(regex.to_re_pattern())
+        for string in strings:
+            assert (pattern.fullmatch(string) is not None) == reference.match(string)
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_batch(self, case, strings):
+        '''La ejecución en lote con NumPy acepta las mismas cadenas'''
+        pytest.importorskip("numpy")
+        regex = case["regex"]
+        expected = [regex.match(string) for string in strings]
+        assert list(regex.compile().match_batch(strings)) == expected
+        assert list(regex.compile("afnd").match_batch(strings)) == expected
+        # También sobre un AFD incompleto y con caracteres fuera del alfabeto.
+        afd = regex.to_afnd().determinize().minimize_hopcroft()
+        afd.transitions = {state: {char: next_state for char, next_state in transitions.items() if char != "a"}
+                           for state, transitions in afd.transitions.items()}
+        assert list(afd.accepts_batch(strings + ["ñ", "añ"])) == [afd.accepts(string) for string in strings + ["ñ", "añ"]]
+        # Los surrogates sueltos no se pueden codificar, pero se rechazan igual que en match.
+        words = ["\ud800", "a\udfff", "\ud83d\ude00"]
+        assert list(regex.compile().match_batch(words)) == [regex.match(word) for word in words]
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_match_many(self, case, strings):
+        '''match_many y filter deciden como match, en el mismo orden'''
+        regex = case["regex"]
+        expected = [regex.match(string) for string in strings]
+        for engine in ("afd", "afnd", "codegen", "re"):
+            compiled = regex.compile(engine)
+            assert list(compiled.match_many(iter(strings))) == expected
+            assert list(compiled.filter(iter(strings))) == [string for string, match in zip(strings, expected) if match]
+
+    @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
+    def test_matcher(self, case, strings):
+        '''Procesar cada cadena de a pedazos da el mismo resultado que match'''
+        regex = case["regex"]
+        for engine in ("afd", "afnd"):
+            matcher = regex.compile(engine).matcher()
+            for string in strings:
+                expected = regex.match(string)
+                matcher.reset()
+                middle = len(string) // 2
+                matcher.feed(string[:middle])
+                resumed = matcher.copy()
+                matcher.feed(string[middle:])
+                assert matcher.finish() == expected
+                for char in string[middle:]:
+                    resumed.feed(char)
+                assert resumed.finish() == expected
+
     @pytest.mark.parametrize("case", cases, ids=lambda case: f"{case['name']}:{case['regex']}")
     def test_min_afd_size(self, case):
         '''El tamaño del AFD mínimo es el esperado'''
@@ -46,3 +174,93 @@ class TestRegex:
         actual_min_afnd_size = regex.to_afnd().determinize().minimize().size()
         assert actual_min_afnd_size == expected_min_afnd_size, f"El AFD mínimo de la regex '{regex}' debería tener {expected_min_afnd_size} estados pero tiene {actual_min_afnd_size}"
 
+
+
+class TestSimplify:
+    def test_deep_nesting(self):
+        '''Simplificar una expresión muy anidada no vuelve a recorrer los subárboles en cada nivel'''
+        regex = Char('y')
+        for code in range(0x100 + 2000, 0x100, -1):
+            regex = Concat(Char(chr(code)), Union(regex, Lambda()))
+        simplified = regex.simplify()
+        assert simplified.size() == regex.size()
+        word = "".join(chr(code) for code in range(0x101, 0x101 + 10))
+        assert simplified.naive_match(word) and not simplified.naive_match(word[1:])
+
+    def test_deep_plus(self):
+        '''r+ con r anulable se simplifica a r* también en expresiones muy anidadas'''
+        regex = Char('a')
+        for _ in range(2000):
+            regex = Plus(Concat(Union(regex, Lambda()), Char('b')))
+        simplified = regex.simplify()
+        assert isinstance(simplified, Plus)
+        assert simplified.naive_match("b" * 5) and simplified.naive_match("a" + "b" * 2000)
+        assert not any(simplified.naive_match(word) for word in ["", "a", "aba", "a" + "b" * 1999 + "a"])
+
+
+class TestMatchMany:
+    @pytest.mark.parametrize("engine", ["afd", "codegen", "re"])
+    def test_processes(self, engine):
+        '''Repartir las cadenas entre procesos da los mismos resultados, en orden'''
+        compiled = Concat(Star(Union(Char('a'), Char('b'))), Char('b')).compile(engine)
+        words = ["".join(letters) for size in range(6) for letters in itertools.product("abc", repeat=size)]
+        expected = [compiled.match(word) for word in words]
+        assert list(compiled.match_many(iter(words), processes=2, chunksize=7)) == expected
+        assert list(compiled.filter(iter(words), processes=2, chunksize=7)) == list(itertools.compress(words, expected))
+
+
+    @pytest.mark.parametrize("engine", ["afd", "afnd", "codegen", "re"])
+    def test_processes_deep_pattern(self, engine):
+        '''Una expresión muy anidada también se puede repartir entre procesos'''
+        regex = Concat(Char('a'), Char('b'))
+        for _ in range(3000):
+            regex = Star(regex)
+        compiled = regex.compile(engine)
+        words = ["abab", "aba", "", "ba"]
+        assert list(compiled.match_many(words, processes=2, chunksize=1)) == [True, False, True, False]
+
+
+class TestMatcher:
+    def test_chunks(self):
+        '''El estado se mantiene entre pedazos y feed indica si todavía puede aceptar'''
+        for engine in ("afd", "afnd", "codegen"):
+            matcher = Concat(Star(Char('a')), Char('b')).compile(engine).matcher()
+            assert matcher.feed("aa") and not matcher.finish()
+            assert matcher.feed("") and matcher.feed("ab") and matcher.finish()
+            assert not matcher.feed("b") and not matcher.finish()
+            assert not matcher.feed("b")
+            matcher.reset()
+            assert matcher.feed("b") and matcher.finish()
+
+    def test_copy(self):
+        '''Las copias avanzan independientemente'''
+        for engine in ("afd", "afnd"):
+            matcher = Concat(Star(Char('a')), Char('b')).compile(engine).matcher()
+            matcher.feed("a")
+            other = copy.copy(matcher)
+            matcher.feed("b")
+            other.feed("c")
+            assert matcher.finish() and not other.finish()
+
+    def test_re_engine(self):
+        '''El motor re no permite reconocer de a pedazos'''
+        with pytest.raises(ValueError):
+            Char('a').compile("re").matcher()
+
+
+class TestRePattern:
+    @pytest.mark.parametrize("regex,words", [
+        (Char('.'), ['.', 'a', '']),
+        (Star(Char('*')), ['', '*', '**', 'a']),
+        (Plus(RegClass({'-', ']', '^', '\\', 'a'})), ['-', ']^\\a', 'b', '']),
+        (Union(Empty(), Char('a')), ['a', '']),
+        (Concat(Char('a'), Empty()), ['a', '']),
+        (Star(Lambda()), ['', 'a']),
+        (Plus(Empty()), ['', 'a']),
+        (Star(Union(Char('('), Concat(Char('?'), Char(')')))), ['', '(?)', '?)(', '?']),
+    ], ids=str)
+    def test_special_cases(self, regex, words):
+        '''∅, λ y los caracteres especiales de re se traducen correctamente'''
+        pattern = re.compile(regex.to_re_pattern())
+        for word in words:
+            assert (pattern.fullmatch(word) is not None) == regex.match(word), f"El patrón '{pattern.pattern}' de '{regex}' difiere en la cadena '{word}'"
@@ -0,0 +1,60 @@
+import tracemalloc
+
+from parse_regex import parse_regex
+from regex.stats import Observer, Statistics
+
+
+class TestStatistics:
+    def test_compile_stages(self):
+        '''Se notifica cada etapa de la compilación con sus tamaños'''
+        stats = Statistics()
+        compiled = parse_regex('(ab)*c').compile(observer=stats)
+        assert [stage.name for stage in stats.stages] == ["simplify", "to_afd", "minimize", "share"]
+        minimized = stats.stages[2]
+        assert minimized.details["states"] == compiled.afd.size()
+        assert minimized.details["alphabet"] == 3
+        assert all(stage.seconds >= 0 and stage.peak_bytes >= 0 for stage in stats.stages)
+        assert "to_afd" in stats.table()
+
+    def test_compile_with_observer_skips_cache(self):
+        '''Con un observador se compila siempre, aunque esté en la caché'''
+        regex = parse_regex('(ab)*c')
+        regex.compile()
+        stats = Statistics()
+        regex.compile(observer=stats)
+        assert stats.stages
+
+    def test_fallback_stage(self):
+        '''La etapa que supera el límite de estados se notifica con el error'''
+        stats = Statistics()
+        compiled = parse_regex('(a|b)*a(a|b)(a|b)').compile(max_states=4, observer=stats)
+        assert compiled.fallback is not None
+        assert [stage.name for stage in stats.stages] == ["simplify", "to_afd", "to_afnd"]
+        assert "error" in stats.stages[1].details
+        assert stats.stages[2].details["states"] == compiled.afnd.size()
+        assert stats.stages[2].details["transitions"] == compiled.afnd.transitions_count()
+
+    def test_custom_observer(self):
+        '''Un observador propio recibe las etapas'''
+        class Names(Observer):
+            def __init__(self):
+                self.names = []
+
+            def on_stage(self, stats):
+                self.names.append(stats.name)
+
+        observer = Names()
+        result = observer.stage("custom", lambda: 42)
+        assert result == 42 and observer.names == ["custom"]
+
+    def test_stage_without_memory(self):
+        '''Con memory=False la etapa se mide sin tracemalloc'''
+        stats = Statistics()
+
+        def run():
+            assert not tracemalloc.is_tracing()
+            return 42
+
+        assert stats.stage("scan", run, memory=False) == 42
+        assert stats.stages[0].peak_bytes is None and stats.stages[0].seconds >= 0
+        assert "scan" in stats.table()
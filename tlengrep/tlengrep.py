@@ -2,8 +2,12 @@
 import optparse
 import sys
 import importlib
+from contextlib import nullcontext
 
 from parse_regex import parse_regex, SyntaxError
+from regex.follow import follow
+from regex.profiler import Profiler
+from regex.stats import Statistics, automaton_details
 
 usage = "%prog [regex] [file]"
 
@@ -12,6 +16,30 @@ opt_parser.add_option("-m", "--module", dest="module", action="store_true",
                       help="read the regular expression from a Python module")
 opt_parser.add_option("-n", "--naive", dest="naive", action="store_true",
                       help="use the naive implementation to match against the regular expression")
+opt_parser.add_option("-e", "--engine", dest="engine", type="choice", choices=["afd", "afnd", "codegen", "re"],
+                      default="afd",
+                      help="matching engine: afd (minimal DFA, default), afnd (simulate the NFA, no determinization) "
+                           "codegen (minimal DFA compiled to Python code) or re (translate to a Python re "
+                           "pattern, backtracking)")
+opt_parser.add_option("-s", "--max-states", dest="max_states", type="int", default=100000,
+                      help="largest DFA the afd engine may build before falling back to afnd "
+                           "(default: %default, 0 for no limit)")
+opt_parser.add_option("-a", "--and", dest="and_patterns", action="append", default=[],
+                      metavar="REGEX", help="only print lines that also match REGEX (can be repeated)")
+opt_parser.add_option("-x", "--not", dest="not_patterns", action="append", default=[],
+                      metavar="REGEX", help="only print lines that do not match REGEX (can be repeated)")
+opt_parser.add_option("-f", "--follow", dest="follow", action="store_true",
+                      help="keep reading the file as it grows (like tail -f), across truncation and rotation, "
+                           "until interrupted")
+opt_parser.add_option("--interval", dest="interval", type="float", default=1.0,
+                      help="seconds to wait for new data in --follow mode (default: %default)")
+opt_parser.add_option("--stats", dest="stats", action="store_true",
+                      help="report time, peak memory and sizes of each stage (parse, compile, scan)")
+opt_parser.add_option("--profile", dest="profile", metavar="FILE",
+                      help="profile compiling and matching and write the collapsed stacks "
+                           "(for flame graph tools) to FILE")
+opt_parser.add_option("-v", "--verbose", dest="verbose", action="store_true",
+                      help="report details about how the regular expression is compiled")
 opts, args = opt_parser.parse_args()
 
 if len(args) < 1:
@@ -20,24 +48,135 @@ if len(args) < 1:
 elif len(args) > 2:
     print("ERROR: Too many arguments", file=sys.stderr)
     exit(1)
-else:
+elif opts.follow and len(args) < 2:
+    print("ERROR: --follow requires a file", file=sys.stderr)
+    exit(1)
+
+
+stats = Statistics() if opts.stats else None
+profiler = Profiler() if opts.profile else None
+
+
+def stage(name, run, describe=None, memory=True):
+    """Ejecuta una etapa, midiéndola si se pidieron las estadísticas."""
+    return stats.stage(name, run, describe, memory) if stats else run()
+
+
+def section(name):
+    """Perfila el bloque dentro de la sección dada, si se pidió el perfil."""
+    return profiler.section(name) if profiler else nullcontext()
+
+
+def parse(pattern):
+    try:
+        return stage("parse", lambda: parse_regex(pattern), lambda regex: {"nodes": regex.size()})
+    except SyntaxError as e:
+        print(f"Syntax error: {e}", file=sys.stderr)
+        exit(1)
+
+
+def report_engine(compiled):
+    if compiled.fallback is not None:
+        print(f"engine: afnd (fallback: {compiled.fallback})", file=sys.stderr)
+    elif compiled.engine == "re":
+        print(f"engine: re ({compiled.pattern})", file=sys.stderr)
+    elif compiled.engine != "afnd":
+        print(f"engine: {compiled.engine} ({compiled.afd.size()} states)", file=sys.stderr)
+    else:
+        print(f"engine: afnd ({compiled.afnd.size()} states)", file=sys.stderr)
+
+
+def build_matcher():
+    """Parsea y compila las expresiones, y devuelve la función que decide cada línea."""
     regex_arg = args[0]
     if opts.module:
         regex_module = importlib.import_module(regex_arg)
         regex = regex_module.__regex__
     else:
-        try:
-            regex = parse_regex(regex_arg)
-        except SyntaxError as e:
-            print(f"Syntax error: {e}", file=sys.stderr)
-            exit(1)
+        regex = parse(regex_arg)
+    and_regexes = [parse(pattern) for pattern in opts.and_patterns]
+    not_regexes = [parse(pattern) for pattern in opts.not_patterns]
+
+    if opts.verbose:
+        simplified = regex.simplify()
+        print(f"simplify: {regex.size()} -> {simplified.size()} nodes ({simplified})",
+              file=sys.stderr)
+
+    if opts.naive:
+        def match(word):
+            return (regex.naive_match(word)
+                    and all(other.naive_match(word) for other in and_regexes)
+                    and not any(other.naive_match(word) for other in not_regexes))
+    else:
+        compiled = regex.compile(opts.engine, opts.max_states or None, stats)
+        and_compiled = [other.compile(opts.engine, opts.max_states or None, stats) for other in and_regexes]
+        not_compiled = [other.compile(opts.engine, opts.max_states or None, stats) for other in not_regexes]
+        if opts.verbose:
+            for each in [compiled, *and_compiled, *not_compiled]:
+                report_engine(each)
+
+        if (and_compiled or not_compiled) and all(
+            each.engine in ("afd", "codegen") for each in [compiled, *and_compiled, *not_compiled]
+        ):
+            # Combinamos todas las expresiones en un único AFD, que recorre cada
+            # línea una sola vez. Las expresiones equivalentes comparten el AFD,
+            # así que alcanza con combinar cada autómata distinto una vez.
+            and_afds = {id(other.afd): other.afd for other in and_compiled if other.afd is not compiled.afd}
+            not_afds = {id(other.afd): other.afd for other in not_compiled}
+
+            def combine():
+                afd = compiled.afd
+                for other in and_afds.values():
+                    afd = afd.intersection(other)
+                for other in not_afds.values():
+                    afd = afd.difference(other)
+                return afd.minimize_hopcroft()
+
+            afd = stage("combine", combine, automaton_details)
+            if opts.verbose:
+                print(f"combined: afd ({afd.size()} states)", file=sys.stderr)
+            match = afd.compile_python() if opts.engine == "codegen" else afd.accepts
+        else:
+            def match(word):
+                return (compiled.match(word)
+                        and all(other.match(word) for other in and_compiled)
+                        and not any(other.match(word) for other in not_compiled))
 
-    with open(args[1]) if len(args) == 2 else sys.stdin as input_file:
+    return match
+
+
+def scan(input_file):
+    lines = matched = size = 0
+    try:
         for line in input_file:
-            if opts.naive:
-                matched = regex.naive_match(line.strip("\n"))
-            else:
-                matched = regex.match(line.strip("\n"))
+            lines += 1
+            if stats:
+                size += len(line.encode())
+            if match(line.strip("\n")):
+                matched += 1
+                print(line, end="", flush=opts.follow)
+    except KeyboardInterrupt:
+        # En modo --follow se termina con Ctrl-C.
+        if not opts.follow:
+            raise
+    return {"lines": lines, "matched": matched, "bytes": size}
+
+
+with section("compile"):
+    match = build_matcher()
+
+if opts.follow:
+    # El autómata compilado se mantiene y cada línea nueva se decide una vez.
+    with section("match"):
+        stage("scan", lambda: scan(follow(args[1], opts.interval)), lambda details: details, memory=False)
+else:
+    with open(args[1]) if len(args) == 2 else sys.stdin as input_file, section("match"):
+        stage("scan", lambda: scan(input_file), lambda details: details, memory=False)
+
+if profiler:
+    profiler.write(opts.profile)
 
-            if matched:
-                print(line, end="")
+if stats:
+    scanned = stats.stages[-1]
+    scanned.details["bytes/s"] = round(scanned.details["bytes"] / scanned.seconds) if scanned.seconds else 0
+    print(stats.table(), file=sys.stderr)